@@ -1,380 +1,516 @@
-import pygame
-import random
+import time
+STARTED = time.perf_counter()  # cold-start reference for --startup
+
 import os
+import pygame
 import sys
 
+import snapshot
+from assets import CACHE_DIR
+from engine import ROWS, Engine, Player, game_rng
+from gamelog import GameLogWriter, GameRecorder
+from instrument import Instruments, SamplingProfiler
+from policies import POLICIES, Policy, make_policy
+from render import (CARD_HEIGHT, CARD_WIDTH, ROW_SPACING, SCREEN_HEIGHT, SCREEN_WIDTH, FrameClock,
+                    RenderCache, Scene, profile_panel, wait_events)
+
 # -------------------------
 # Constants
 # -------------------------
-SCREEN_WIDTH = 1200
-SCREEN_HEIGHT = 700
-CARD_WIDTH = 80
-CARD_HEIGHT = 120
-ROWS = 4
-ROW_SPACING = 100
 PLAYER_Y_START = 500
-SELECTION_TIME = 15
-MAX_PENALTY = 64
-
-BULL_HEADS = {55: 7, 5: 2, 10: 3, 1: 1}
-
-def get_bull_heads(card_number):
-    if card_number in BULL_HEADS:
-        return BULL_HEADS[card_number]
-    elif card_number % 11 == 0:
-        return 5
-    elif card_number % 10 == 0:
-        return 3
-    elif card_number % 5 == 0:
-        return 2
-    else:
-        return 1
+AI_POLICY = "random"
+SHOW_FPS = False
+LOG_PATH = None  # game log that finished games are appended to
+SHOW_PROFILE = False  # start with the per-phase overlay on (F4 toggles)
+PROFILE_PATH = None  # session profile output
+PROFILER = "cprofile"  # or "sample" for collapsed stacks from a sampling thread
+REPORT_STARTUP = False  # print startup timings and quit after the first frame
+STATS_REFRESH = 500  # ms between frame-counter updates while idle
+REVEAL_DURATION = 3000  # ms the played cards stay on screen
+SPEEDS = (1, 10, None)  # spectator speeds; None runs tricks as fast as the engine allows
+WATCH_SPEED = 1
+WATCH_PLAYERS = None  # start straight into a spectated game of this many AIs
+SPECTATE_PAUSE = 1000  # ms a spectated board stays up before the next cards are revealed
+STEP_BUDGET = 0.025  # seconds of simulation per frame, so the window keeps up at any speed
+SESSION_PATH = os.path.join(CACHE_DIR, "session.6ns")  # unfinished game saved on quit
+
+CACHE = RenderCache()  # shared by the game and every menu screen
+INSTRUMENTS = Instruments()
 
 # -------------------------
-# Card Class
+# App: one event loop for every screen
 # -------------------------
-class Card: # Card no, bull head, hovering
-    def __init__(self, number):
-        self.number = number
-        self.penalty = get_bull_heads(number)
-        self.rect = pygame.Rect(0, 0, CARD_WIDTH, CARD_HEIGHT)
-
-# -------------------------
-# Player Class
-# -------------------------
-class Player: 
-    def __init__(self, name, is_human=False):
-        self.name = name
-        self.hand = []
-        self.penalty_points = 0
-        self.is_human = is_human
-        self.selected_card = None
-
-    def play_card(self):
-        if self.is_human:
-            if self.selected_card:
-                card = self.selected_card
-                self.selected_card = None
-                return card
-            return None
-        else:
-            if self.hand:
-                return self.hand.pop(random.randint(0, len(self.hand) - 1))
-        return None
-
-# -------------------------
-# Game Class
-# -------------------------
-class Game: # Initialization
-    def __init__(self, player_count):
+# Each screen is a state object with
+#   update(now)   advance timers / game logic, never blocks
+#   draw(scene)   add this frame's items to the retained scene
+#   handle(event) react to input
+#   timeout(now)  ms until the screen next changes on its own (None = never)
+#   close()       the window is closing
+# Screens switch by calling app.switch(), so nothing nests or recurses.
+class App:
+    def __init__(self):
+        init_started = time.perf_counter()
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("6nimmt! Game")
-        self.clock = pygame.time.Clock()
+        pygame.display.set_caption("6nimmt!")
+        self.clock = FrameClock()
+        self.clock.show_stats = SHOW_FPS
         self.running = True
+        self.profile = None  # cached overlay panel
+        self.profile_at = 0
 
-        bg_file = r"assets\background.png.jpg"
-        bull_file = r"assets\bull.png"
-
-        if os.path.exists(bg_file):
-            self.background = pygame.image.load(bg_file)
-            self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        else:
-            self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Assets resolve relative to the module, so any OS and working directory works
+        self.background = CACHE.assets.image("background.png.jpg", (SCREEN_WIDTH, SCREEN_HEIGHT))
+        if self.background is None:
+            self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
             self.background.fill((50, 150, 50))
+        self.bull_img = CACHE.assets.image("bull.png", (CARD_WIDTH // 4, CARD_WIDTH // 4), alpha=True)
+        CACHE.set_bull_image(self.bull_img)
+
+        self.scene = Scene(self.screen, self.background)
+        self.state = MainMenu(self)
+        self.timings = {"imports": (init_started - STARTED) * 1000,
+                        "init": (time.perf_counter() - init_started) * 1000}
+
+    def switch(self, state):
+        self.state = state
+        self.scene.invalidate()
+
+    def idle_timeout(self, timeout=None):
+        # How long the loop may sleep waiting for input; the frame counter,
+        # when shown, still needs a periodic refresh.
+        if self.clock.show_stats or INSTRUMENTS.enabled:
+            return STATS_REFRESH if timeout is None else min(timeout, STATS_REFRESH)
+        return timeout
+
+    def draw_profile(self, now):
+        # The overlay is rebuilt every STATS_REFRESH ms, not every frame
+        if self.profile is None or now - self.profile_at >= STATS_REFRESH:
+            self.profile = profile_panel(CACHE, self.clock, INSTRUMENTS)
+            self.profile_at = now
+        self.scene.blit("profile", self.profile, (0, 30))
+
+    def dispatch(self, event):
+        self.state.handle(event)
 
-        if os.path.exists(bull_file):
-            self.bull_img = pygame.image.load(bull_file)
-            self.bull_img = pygame.transform.scale(self.bull_img, (CARD_WIDTH // 4, CARD_WIDTH // 4))
-        else:
-            self.bull_img = None
+    def run(self):
+        while self.running:
+            started = time.perf_counter()
+            now = pygame.time.get_ticks()
+            self.state.update(now)
+            self.scene.begin()
+            self.state.draw(self.scene)
+            if INSTRUMENTS.enabled:
+                self.draw_profile(now)
+            self.scene.present(self.clock, CACHE)
+            busy = time.perf_counter() - started
+            if "first_frame" not in self.timings:
+                self.timings["first_frame"] = busy * 1000
+                self.timings["total"] = (time.perf_counter() - STARTED) * 1000
+                if REPORT_STARTUP:
+                    print(startup_report(self.timings))
+                    break
+
+            events = wait_events(self.idle_timeout(self.state.timeout(pygame.time.get_ticks())))
+            started = time.perf_counter()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.state.close()
+                    self.running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.clock.show_stats = not self.clock.show_stats
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    # Toggled between frames, never inside a timed call
+                    INSTRUMENTS.toggle()
+                    self.profile = None
+                else:
+                    self.dispatch(event)
+            INSTRUMENTS.end_frame(busy + time.perf_counter() - started)
+            self.clock.tick(30)
+        pygame.quit()
+
+class Screen: # Defaults for states that only react to input
+    def __init__(self, app):
+        self.app = app
+
+    def update(self, now):
+        pass
+
+    def handle(self, event):
+        pass
+
+    def timeout(self, now):
+        return None
 
-        self.players = [Player("You", is_human=True)] + \
-            [Player(f"AI{i}") for i in range(1, player_count)]
-        self.deck = [Card(i) for i in range(1, 105)]
-        random.shuffle(self.deck)
+    def close(self):
+        pass
 
-        for _ in range(10):
-            for player in self.players:
-                if self.deck:
-                    player.hand.append(self.deck.pop())
+def blink(now, period):
+    # Blinking text: visible for one period, hidden for the next
+    return (now // period) % 2 == 0
 
-        self.rows = [[self.deck.pop()] for _ in range(ROWS)]
+def blink_timeout(now, period):
+    return period - now % period
+
+# -------------------------
+# Game Class
+# -------------------------
+# Phases of a game, advanced by update() and handle():
+#   select  -> human picks a card while AIs decide one per frame
+#   reveal  -> played cards shown for REVEAL_DURATION
+#   place   -> cards placed in ascending order, one step per frame
+#   row     -> waiting for the human to pick a row to take
+#   over    -> results and Play Again
+# Closing the window mid-game saves it to SESSION_PATH; Resume on the main
+# menu restores it at the same trick.
+class Game(Screen):
+    def __init__(self, app, player_count, engine=None):
+        super().__init__(app)
+        CACHE.build_card_faces()
+        if engine is None:
+            self.players = [Player("You", is_human=True)] + \
+                [Player(f"AI{i}", policy=make_policy(AI_POLICY)) for i in range(1, player_count)]
+            rng, seed = game_rng()
+            self.recorder = GameRecorder(self.players, seed) if LOG_PATH else None
+            self.engine = Engine(self.players, rng, self.recorder)
+        else:
+            # Resumed games are not logged: the log needs every deal from the start
+            self.players = engine.players
+            self.recorder = None
+            self.engine = engine
+        self.hand_rects = []
+        self.overlay = pygame.Surface((CARD_WIDTH * 6 + 14, CARD_HEIGHT + 14), pygame.SRCALPHA)
+        self.overlay.fill((255, 150, 0, 80))  # Transparent highlight
+        self.play_again_rect = pygame.Rect(SCREEN_WIDTH // 2 - 320 // 2, 550, 320, 68)
+        now = pygame.time.get_ticks()
+        self.start_selection(now)
+        if self.engine.next_play() is not None:
+            # Saved mid-trick: show the cards again, then carry on placing
+            self.show("reveal" if self.engine.trick_pos == 0 else "place", now)
+
+    @classmethod
+    def resume(cls, app):
+        engine = snapshot.load(SESSION_PATH)
+        os.remove(SESSION_PATH)
+        return cls(app, len(engine.players), engine)
+
+    def close(self):
+        if self.phase == "over":
+            return
+        # AIs that already chose this trick get their cards back while saving,
+        # so the saved game restarts the selection cleanly
+        chosen = self.ai_cards if self.phase == "select" else {}
+        for player, card in chosen.items():
+            player.hand.append(card)
+        try:
+            os.makedirs(os.path.dirname(SESSION_PATH), exist_ok=True)
+            snapshot.save(self.engine, SESSION_PATH)
+        except OSError as error:
+            print(f"could not save the game: {error}")
+        finally:
+            for player, card in chosen.items():
+                player.hand.remove(card)
+
+    @property
+    def scene(self):
+        return self.app.scene
 
     # -------------------------
     # Drawing Methods(visuals)
     # -------------------------
-    def draw_card(self, card, x, y, clickable=False):
-        pygame.draw.rect(self.screen, (255, 255, 255), (x, y, CARD_WIDTH, CARD_HEIGHT))
-        pygame.draw.rect(self.screen, (0, 0, 0), (x, y, CARD_WIDTH, CARD_HEIGHT), 2)
-
-        font = pygame.font.SysFont(None, 36)
-        text = font.render(str(card.number), True, (0, 0, 0))
-        text_rect = text.get_rect(center=(x + CARD_WIDTH // 2, y + CARD_HEIGHT // 2))
-        self.screen.blit(text, text_rect)
-
-        if self.bull_img:
-            max_per_row = CARD_WIDTH // (self.bull_img.get_width() + 2)
-            rows_needed = (card.penalty + max_per_row - 1) // max_per_row
-            for r in range(rows_needed):
-                bulls_in_row = min(max_per_row, card.penalty - r * max_per_row)
-                for i in range(bulls_in_row):
-                    bx = x + i * (self.bull_img.get_width() + 2) + 5
-                    by = y + r * (self.bull_img.get_height() + 2) + 5
-                    self.screen.blit(self.bull_img, (bx, by))
-        card.rect.topleft = (x, y)
+    # Drawing adds items to the retained scene; Scene.present repaints only
+    # the regions that changed since the last frame.
+    def draw(self, scene):
+        if self.phase == "over":
+            self.display_game_over()
+            return
+        self.draw_rows()
+        self.draw_players()
+        if self.phase == "select":
+            self.draw_hand(self.players[0], self.timer_left(pygame.time.get_ticks()))
+        elif self.phase in ("reveal", "place"):
+            self.display_played_cards(self.plays)
+        elif self.phase == "row":
+            self.draw_row_choice()
+
+    def draw_card(self, key, card, x, y, clickable=False):
+        self.scene.blit(key, CACHE.card_face(card), (x, y))
         if clickable:
-            return card.rect
+            return pygame.Rect(x, y, CARD_WIDTH, CARD_HEIGHT)
 
     def draw_rows(self):
-        for i, row in enumerate(self.rows):
+        for i, row in enumerate(self.engine.rows):
             for j, card in enumerate(row):
                 x = 50 + j * (CARD_WIDTH + 10)
                 y = 50 + i * ROW_SPACING
-                self.draw_card(card, x, y)
+                self.draw_card(("row", i, j), card, x, y)
 
     def draw_players(self):
-        font = pygame.font.SysFont(None, 30)
         for i, player in enumerate(self.players):
             x = SCREEN_WIDTH - 250
             y = 50 + i * 35
-            text = font.render(f"{player.name}: {player.penalty_points}", True, (0, 0, 0))
-            self.screen.blit(text, (x, y))
+            text = CACHE.label(f"{player.name}: {player.penalty_points}", 30, (0, 0, 0))
+            self.scene.blit(("score", i), text, (x, y))
 
     def draw_hand(self, player, timer=None):
         self.hand_rects = []
         x_start = 100
         y = SCREEN_HEIGHT - CARD_HEIGHT - 40
         for idx, card in enumerate(player.hand):
-            rect = self.draw_card(card, x_start + idx * (CARD_WIDTH + 10), y, clickable=True)
+            rect = self.draw_card(("hand", idx), card, x_start + idx * (CARD_WIDTH + 10), y, clickable=True)
             self.hand_rects.append((rect, card))
         if timer is not None:
-            font = pygame.font.SysFont(None, 28)
-            timer_text = font.render(f"Time left: {timer}", True, (0, 0, 0))
-            self.screen.blit(timer_text, (SCREEN_WIDTH - 200, SCREEN_HEIGHT - 40))
+            timer_text = CACHE.label(f"Time left: {timer}", 28, (0, 0, 0))
+            self.scene.blit("timer", timer_text, (SCREEN_WIDTH - 200, SCREEN_HEIGHT - 40))
 
-    # -------------------------
-    # Game Reveal & Placement Methods
-    # -------------------------
     def display_played_cards(self, plays):
-        # Show all played cards in the center for 3 seconds, with rows still visible
-        reveal_duration = 3000  # milliseconds (3 seconds)
-        font = pygame.font.SysFont(None, 26)
-        title_font = pygame.font.SysFont("comicsansms", 40, bold=True)
+        # All played cards in the center, with rows still visible
         spacing = CARD_WIDTH + 20
         start_x = (SCREEN_WIDTH - (len(plays) * spacing)) // 2
         y = SCREEN_HEIGHT // 2 + ROW_SPACING * 2  # below all rows
-        title = title_font.render("Revealing the selected cards", True, (160, 0, 0))
-
-        start_time = pygame.time.get_ticks()
-        while pygame.time.get_ticks() - start_time < reveal_duration:
-            self.screen.blit(self.background, (0, 0))
-            self.draw_rows()
-            self.draw_players()
-            # Draw the title above revealed cards
-            self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, y - 60))
-            # Draw all revealed cards
-            for i, (card, player) in enumerate(plays):
-                self.draw_card(card, start_x + i * spacing, y)
-                name = font.render(player.name, True, (0, 0, 0))
-                self.screen.blit(name, (start_x + i * spacing, y + CARD_HEIGHT + 6))
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-            self.clock.tick(30)
+        title = CACHE.label("Revealing the selected cards", 40, (160, 0, 0), "comicsansms", bold=True)
+        # Draw the title above revealed cards
+        self.scene.blit("reveal-title", title, (SCREEN_WIDTH//2 - title.get_width()//2, y - 60))
+        # Draw all revealed cards
+        for i, (card, player) in enumerate(plays):
+            self.draw_card(("reveal", i), card, start_x + i * spacing, y)
+            name = CACHE.label(player.name, 26, (0, 0, 0))
+            self.scene.blit(("reveal-name", i), name, (start_x + i * spacing, y + CARD_HEIGHT + 6))
+
+    def row_rects(self):
+        return [pygame.Rect(50 - 7, 50 + idx * ROW_SPACING - 7, CARD_WIDTH * 6 + 14, CARD_HEIGHT + 14)
+                for idx in range(ROWS)]
+
+    def draw_row_choice(self):
+        prompt = CACHE.label("Your card is lowest! Click a row to take:", 40, (200, 50, 50))
+        self.scene.blit("prompt", prompt, (SCREEN_WIDTH // 2 - prompt.get_width() // 2, SCREEN_HEIGHT - 100))
+        mouse = pygame.mouse.get_pos()
+        for idx, rect in enumerate(self.row_rects()):
+            self.scene.blit(("row-overlay", idx), self.overlay, rect.topleft)
+            if rect.collidepoint(mouse):
+                self.scene.rect(("row-hover", idx), (255, 0, 0), rect, 5)
 
-    def get_human_row_choice(self):
-        font = pygame.font.SysFont(None, 40)
-        highlight_color = (255, 100, 50, 90)
-        overlay = pygame.Surface((CARD_WIDTH * 6 + 14, CARD_HEIGHT + 14), pygame.SRCALPHA)
-        overlay.fill((255, 150, 0, 80))  # Transparent highlight
-
-        while True:
-            self.screen.blit(self.background, (0, 0))
-            self.draw_rows()
-            self.draw_players()
-            prompt = font.render("Your card is lowest! Click a row to take:", True, (200, 50, 50))
-            self.screen.blit(prompt, (SCREEN_WIDTH // 2 - prompt.get_width() // 2, SCREEN_HEIGHT - 100))
-            mx, my = pygame.mouse.get_pos()
-            for idx in range(ROWS):
-                x = 50 - 7
-                y = 50 + idx * ROW_SPACING - 7
-                w = CARD_WIDTH * 6 + 14
-                h = CARD_HEIGHT + 14
-                self.screen.blit(overlay, (x, y))
-                if x <= mx <= x + w and y <= my <= y + h:
-                    pygame.draw.rect(self.screen, (255, 0, 0), (x, y, w, h), 5)
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    for idx in range(ROWS):
-                        x = 50 - 7
-                        y = 50 + idx * ROW_SPACING - 7
-                        w = CARD_WIDTH * 6 + 14
-                        h = CARD_HEIGHT + 14
-                        if x <= mx <= x + w and y <= my <= y + h:
-                            return idx
-            self.clock.tick(30)
+    def display_game_over(self):
+        if blink(pygame.time.get_ticks() - self.over_at, 1000):
+            go_text = CACHE.label("GAME OVER", 90, (0, 0, 0), "comicsansms", bold=True)
+            self.scene.blit("game-over", go_text, (SCREEN_WIDTH // 2 - go_text.get_width() // 2, 50))
+        # Display results
+        sorted_players = sorted(self.players, key=lambda p: p.penalty_points)
+        y_pos = 200
+        for i, player_final in enumerate(sorted_players):
+            text = CACHE.label(f"{player_final.name}: {player_final.penalty_points} points", 50, (0, 0, 0))
+            self.scene.blit(("result", i), text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y_pos))
+            y_pos += 60
+
+        # Draw Play Again button
+        button_rect = self.play_again_rect
+        self.scene.rect("button", (0, 0, 0), button_rect)
+        button_label = CACHE.label("Play Again", 50, (255, 255, 255), "comicsansms", bold=True)
+        self.scene.blit(
+            "button-label",
+            button_label,
+            (button_rect.centerx - button_label.get_width() // 2, button_rect.centery - button_label.get_height() // 2)
+        )
 
     # -------------------------
     # Game Logic
     # -------------------------
-    def smart_place_card(self, player, card):
-        min_diff = float("inf")
-        target_row = None
-        for i, row in enumerate(self.rows):
-            last_card = row[-1]
-            if last_card.number < card.number:
-                diff = card.number - last_card.number
-                if diff < min_diff:
-                    min_diff = diff
-                    target_row = i
-        if target_row is not None:
-            row = self.rows[target_row]
-            if len(row) >= 5:
-                total_penalty = sum(c.penalty for c in row)
-                player.penalty_points += total_penalty
-                self.rows[target_row] = [card]
-            else:
-                row.append(card)
-        else:
-            # Card too low for all rows
-            if player.is_human:
-                row_index = self.get_human_row_choice()
-            else:
-                # AI: select row with least penalty points
-                row_index = min(range(ROWS), key=lambda i: sum(c.penalty for c in self.rows[i]))
-            total_penalty = sum(c.penalty for c in self.rows[row_index])
-            player.penalty_points += total_penalty
-            self.rows[row_index] = [card]
-
-    def run_round(self):
+    def start_selection(self, now):
+        self.phase = "select"
+        self.select_started = now
+        self.plays = []
+        self.ai_cards = {}
+        self.ai_pending = [player for player in self.players if not player.is_human]
+
+    def show(self, phase, now):
+        # Enter `phase` for the engine's current state, with its timers
+        # starting at `now`; also used to draw recorded games offscreen
+        if phase == "select":
+            self.start_selection(now)
+            return
+        self.phase = phase
+        if phase in ("reveal", "place", "row"):
+            self.plays = self.engine.trick
+            self.reveal_until = now + REVEAL_DURATION
+        elif phase == "over":
+            self.over_at = now
+
+    def timer_left(self, now):
+        return max(int(self.engine.rules.selection_time) - (now - self.select_started) // 1000, 0)
+
+    def decide_next_ai(self):
+        player = self.ai_pending.pop(0)
+        card = self.engine.choose_play(player)
+        if card:
+            self.ai_cards[player] = card
+
+    def finish_selection(self, card, now):
+        # `card` is None when the human has nothing left to play
         human = self.players[0]
-        if human.hand:
-            # -- Human selects card
-            start_ticks = pygame.time.get_ticks()
-            selecting = True
-            while selecting:
-                elapsed = int((pygame.time.get_ticks() - start_ticks) / 1000)
-                timer_left = max(SELECTION_TIME - elapsed, 0)
-                self.screen.blit(self.background, (0, 0))
-                self.draw_rows()
-                self.draw_players()
-                self.draw_hand(human, timer_left)
-                pygame.display.flip()
-                if timer_left <= 0:
-                    human.selected_card = min(human.hand, key=lambda c: c.number)
-                    human.hand.remove(human.selected_card)
-                    selecting = False
-                    break
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        mx, my = pygame.mouse.get_pos()
-                        for rect, card in self.hand_rects:
-                            if rect.collidepoint(mx, my):
-                                human.selected_card = card
-                                human.hand.remove(card)
-                                selecting = False
-                                break
-
-        # -- Let all players play
+        while self.ai_pending:
+            self.decide_next_ai()
         plays = []
-        for player in self.players:
-            card = player.play_card()
-            if card:
-                plays.append((card, player))
-
-        # -- Reveal all selections
-        self.display_played_cards(plays)
-
-        # -- Place cards in ascending order
-        plays.sort(key=lambda x: x[0].number)
-        for card, player in plays:
-            self.smart_place_card(player, card)
-
-    def run(self):
-        while True:
-            for player in self.players:
-                if player.penalty_points >= MAX_PENALTY:
-                    self.display_game_over()
+        if card is not None:
+            human.hand.remove(card)
+            plays.append((card, human))
+        plays += [(self.ai_cards[player], player) for player in self.players if player in self.ai_cards]
+        self.plays = plays
+        self.engine.start_trick(plays)
+        self.phase = "reveal"
+        self.reveal_until = now + REVEAL_DURATION
+
+    def after_trick(self, now):
+        if self.engine.is_over():
+            self.phase = "over"
+            self.over_at = now
+            if self.recorder is not None:
+                with GameLogWriter(LOG_PATH) as log:
+                    log.record(self.recorder)
+            return
+        if self.engine.hands_empty():
+            self.engine.deal()
+        self.start_selection(now)
+
+    def update(self, now):
+        if self.phase == "select":
+            human = self.players[0]
+            if not human.hand:
+                self.finish_selection(None, now)
+            elif self.timer_left(now) <= 0:
+                self.finish_selection(min(human.hand), now)
+            elif self.ai_pending:
+                # AIs pick simultaneously with the human, one per frame
+                self.decide_next_ai()
+        elif self.phase == "reveal" and now >= self.reveal_until:
+            self.phase = "place"
+        if self.phase == "place":
+            # -- Place cards in ascending order until a human row choice
+            while self.engine.next_play() is not None:
+                card, player = self.engine.next_play()
+                if player.is_human and self.engine.needs_row_choice():
+                    self.phase = "row"
                     return
+                self.engine.place_next()
+            self.after_trick(now)
+
+    def timeout(self, now):
+        if self.phase == "select":
+            if self.ai_pending:
+                return 0  # keep stepping AI decisions
+            # Wake up for the next timer second
+            return 1000 - (now - self.select_started) % 1000
+        if self.phase == "reveal":
+            return max(self.reveal_until - now, 0)
+        if self.phase == "over":
+            return blink_timeout(now - self.over_at, 1000)
+        return None  # row choice: the hover highlight only changes on mouse motion
+
+    def handle(self, event):
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return
+        now = pygame.time.get_ticks()
+        if self.phase == "select":
+            for rect, card in self.hand_rects:
+                if rect.collidepoint(event.pos):
+                    self.finish_selection(card, now)
+                    break
+        elif self.phase == "row":
+            for idx, rect in enumerate(self.row_rects()):
+                if rect.collidepoint(event.pos):
+                    self.engine.place_next(idx)
+                    self.phase = "place"
+                    break
+        elif self.phase == "over":
+            if self.play_again_rect.collidepoint(event.pos):
+                self.app.switch(MainMenu(self.app))
 
-            if any(player.hand for player in self.players):
-                self.run_round()
-            else:
-                self.deck = [Card(i) for i in range(1, 105)]
-                random.shuffle(self.deck)
-                for _ in range(10):
-                    for player in self.players:
-                        if self.deck:
-                            player.hand.append(self.deck.pop())
-
-    # -------------------------
-    # Game Over Display
-    # -------------------------
-    def display_game_over(self):
-        font = pygame.font.SysFont(None, 50)
-        game_over_font = pygame.font.SysFont("comicsansms", 90, bold=True)
-        blink_timer = 0
-        show_text = True
-
-        # Play Again button config
-        button_w = 320
-        button_h = 68
-        button_rect = pygame.Rect(SCREEN_WIDTH // 2 - button_w//2, 550, button_w, button_h)
-        button_font = pygame.font.SysFont("comicsansms", 50, bold=True)
-
-        while True:
-            self.screen.blit(self.background, (0, 0))
-            if pygame.time.get_ticks() - blink_timer > 1000:
-                show_text = not show_text
-                blink_timer = pygame.time.get_ticks()
-            if show_text:
-                go_text = game_over_font.render("GAME OVER", True, (0, 0, 0))
-                self.screen.blit(go_text, (SCREEN_WIDTH // 2 - go_text.get_width() // 2, 50))
-            # Display results
-            sorted_players = sorted(self.players, key=lambda p: p.penalty_points)
-            y_pos = 200
-            for player_final in sorted_players:
-                text = font.render(f"{player_final.name}: {player_final.penalty_points} points", True, (0, 0, 0))
-                self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, y_pos))
-                y_pos += 60
-
-            # Draw Play Again button
-            pygame.draw.rect(self.screen, (0, 0, 0), button_rect)
-            button_label = button_font.render("Play Again", True, (255, 255, 255))
-            self.screen.blit(
-                button_label,
-                (button_rect.centerx - button_label.get_width() // 2, button_rect.centery - button_label.get_height() // 2)
-            )
-
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if button_rect.collidepoint(event.pos):
-                        main_menu()
-                        return
-            self.clock.tick(10)
+# -------------------------
+# Spectator
+# -------------------------
+# An AI-only game on its own clock: simulated time runs at 1x, 10x or
+# flat out, and every frame draws whatever state the simulation reached,
+# so the frame rate never limits (or is limited by) the game speed.
+#   select  -> board shown for SPECTATE_PAUSE, then every AI plays at once
+#   reveal  -> played cards shown for REVEAL_DURATION, then all are placed
+#   over    -> results and Play Again
+class Spectator(Game):
+    def __init__(self, app, player_count):
+        players = [Player(f"AI{i}", policy=make_policy(AI_POLICY)) for i in range(1, player_count + 1)]
+        rng, seed = game_rng()
+        recorder = GameRecorder(players, seed) if LOG_PATH else None
+        super().__init__(app, player_count, Engine(players, rng, recorder))
+        self.recorder = recorder  # unlike a resumed game, this one is logged from the first deal
+        self.speed = WATCH_SPEED
+        self.tricks = 0
+        self.sim_time = 0  # simulated ms since the game started
+        self.next_step = SPECTATE_PAUSE
+        self.updated_at = pygame.time.get_ticks()
+
+    def close(self):
+        pass  # watched games are not saved
+
+    def draw(self, scene):
+        if self.phase == "over":
+            self.display_game_over()
+            return
+        self.draw_rows()
+        self.draw_players()
+        if self.phase == "reveal":
+            self.display_played_cards(self.plays)
+        speed = f"{self.speed}x" if self.speed else "max"
+        status = CACHE.label(f"Trick {self.tricks}   speed {speed}   1 / 2 / 3: 1x / 10x / max   Esc: menu",
+                             28, (0, 0, 0))
+        scene.blit("status", status, (50, 15))
+
+    def step(self, now):
+        # Advances one phase; returns the simulated ms until the next one
+        if self.phase == "select":
+            self.plays = self.engine.collect_plays()
+            self.engine.start_trick(self.plays)
+            self.phase = "reveal"
+            return REVEAL_DURATION
+        while self.engine.next_play() is not None:
+            self.engine.place_next()
+        self.tricks += 1
+        self.after_trick(now)
+        return SPECTATE_PAUSE
+
+    def update(self, now):
+        if self.speed:
+            self.sim_time += (now - self.updated_at) * self.speed
+        self.updated_at = now
+        deadline = time.perf_counter() + STEP_BUDGET
+        while self.phase != "over":
+            if self.speed is None:
+                self.sim_time = max(self.sim_time, self.next_step)
+            elif self.next_step > self.sim_time:
+                break
+            self.next_step += self.step(now)
+            if time.perf_counter() >= deadline:
+                # Drop time the simulation could not keep up with
+                self.sim_time = min(self.sim_time, self.next_step)
+                break
+
+    def timeout(self, now):
+        if self.phase == "over":
+            return super().timeout(now)
+        if self.speed is None:
+            return 0
+        return max(-((self.sim_time - self.next_step) // self.speed), 0)
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.app.switch(MainMenu(self.app))
+            elif event.unicode in ("1", "2", "3"):
+                self.speed = SPEEDS[int(event.unicode) - 1]
+        else:
+            super().handle(event)
 
 # -------------------------
 # How to Play Screen
 # -------------------------
-def show_how_to_play(screen, background, clock):
-    font = pygame.font.SysFont("comicsansms", 42)
-    rule_font = pygame.font.SysFont("comicsansms", 34)
-    back_rect = pygame.Rect(SCREEN_WIDTH - 180, SCREEN_HEIGHT - 80, 150, 50)
-
+class HowToPlay(Screen):
     rules = [
         "Each player starts with 10 cards.",
         "Four rows start on the table with one card each.",
@@ -385,145 +521,223 @@ def show_how_to_play(screen, background, clock):
         "Game ends when someone reaches 64 points!",
     ]
 
-    while True:
-        screen.blit(background, (0, 0))
-        title = font.render("How to Play", True, (0, 0, 0))
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
+    def __init__(self, app):
+        super().__init__(app)
+        self.back_rect = pygame.Rect(SCREEN_WIDTH - 180, SCREEN_HEIGHT - 80, 150, 50)
+
+    def draw(self, scene):
+        title = CACHE.label("How to Play", 42, (0, 0, 0), "comicsansms")
+        scene.blit("title", title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
 
         y_offset = 150
-        for line in rules:
-            bullet_text = rule_font.render(f"• {line}", True, (0, 0, 0))
-            screen.blit(bullet_text, (120, y_offset))
+        for i, line in enumerate(self.rules):
+            bullet_text = CACHE.label(f"• {line}", 34, (0, 0, 0), "comicsansms")
+            scene.blit(("rule", i), bullet_text, (120, y_offset))
             y_offset += 60
 
-        pygame.draw.rect(screen, (0, 0, 0), back_rect)
-        back_text = rule_font.render("Back", True, (255, 255, 255))
-        screen.blit(back_text, (back_rect.centerx - back_text.get_width() // 2, back_rect.centery - back_text.get_height() // 2))
+        back_rect = self.back_rect
+        scene.rect("back", (0, 0, 0), back_rect)
+        back_text = CACHE.label("Back", 34, (255, 255, 255), "comicsansms")
+        scene.blit("back-label", back_text, (back_rect.centerx - back_text.get_width() // 2, back_rect.centery - back_text.get_height() // 2))
 
-        pygame.display.flip()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN and back_rect.collidepoint(event.pos):
-                return
-        clock.tick(30)
+    def handle(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and self.back_rect.collidepoint(event.pos):
+            self.app.switch(MainMenu(self.app))
 
 # -------------------------
 # Menu and Flow
 # -------------------------
-def main_menu():
-    pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("6nimmt! Menu")
-    clock = pygame.time.Clock()
-
-    bg_file = r"assets\background.png.jpg"
-    if os.path.exists(bg_file):
-        background = pygame.image.load(bg_file)
-        background = pygame.transform.scale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-    else:
-        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        background.fill((50, 150, 50))
-
-    title_font = pygame.font.SysFont("comicsansms", 80, bold=True)
-    instr_font = pygame.font.SysFont("comicsansms", 45)
-    small_font = pygame.font.SysFont("comicsansms", 35)
-
-    play_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50, 300, 70)
-    howto_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 + 70, 300, 70)
-    exit_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 + 200, 300, 70)
-
-    while True:
-        screen.blit(background, (0, 0))
-        title_text = title_font.render("6nimmt!", True, (0, 0, 0))
-        screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 2 - 200))
-
-        pygame.draw.rect(screen, (0, 0, 0), play_rect)
-        play_text = instr_font.render("Play", True, (255, 255, 255))
-        screen.blit(play_text, (play_rect.centerx - play_text.get_width() // 2, play_rect.centery - play_text.get_height() // 2))
-
-        pygame.draw.rect(screen, (0, 0, 0), howto_rect)
-        how_text = small_font.render("How to Play", True, (255, 255, 255))
-        screen.blit(how_text, (howto_rect.centerx - how_text.get_width() // 2, howto_rect.centery - how_text.get_height() // 2))
-
-        pygame.draw.rect(screen, (0, 0, 0), exit_rect)
-        exit_text = small_font.render("Exit", True, (255, 255, 255))
-        screen.blit(exit_text, (exit_rect.centerx - exit_text.get_width() // 2, exit_rect.centery - exit_text.get_height() // 2))
-
-        pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if play_rect.collidepoint(event.pos):
-                    return player_selection(screen, background, clock)
-                elif howto_rect.collidepoint(event.pos):
-                    show_how_to_play(screen, background, clock)
-                elif exit_rect.collidepoint(event.pos):
-                    pygame.quit()
-                    sys.exit()
-        clock.tick(30)
+class MainMenu(Screen):
+    def __init__(self, app):
+        super().__init__(app)
+        self.play_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50, 300, 70)
+        self.howto_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 + 70, 300, 70)
+        self.exit_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 + 200, 300, 70)
+        self.resume_rect = pygame.Rect(SCREEN_WIDTH // 2 + 170, SCREEN_HEIGHT // 2 - 50, 200, 70)
+        self.watch_rect = pygame.Rect(SCREEN_WIDTH // 2 - 370, SCREEN_HEIGHT // 2 - 50, 200, 70)
+        self.can_resume = os.path.exists(SESSION_PATH)
+
+    def draw(self, scene):
+        title_text = CACHE.label("6nimmt!", 80, (0, 0, 0), "comicsansms", bold=True)
+        scene.blit("title", title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 2 - 200))
+
+        play_rect, howto_rect, exit_rect = self.play_rect, self.howto_rect, self.exit_rect
+        scene.rect("play", (0, 0, 0), play_rect)
+        play_text = CACHE.label("Play", 45, (255, 255, 255), "comicsansms")
+        scene.blit("play-label", play_text, (play_rect.centerx - play_text.get_width() // 2, play_rect.centery - play_text.get_height() // 2))
+
+        if self.can_resume:
+            resume_rect = self.resume_rect
+            scene.rect("resume", (0, 0, 0), resume_rect)
+            resume_text = CACHE.label("Resume", 35, (255, 255, 255), "comicsansms")
+            scene.blit("resume-label", resume_text, (resume_rect.centerx - resume_text.get_width() // 2, resume_rect.centery - resume_text.get_height() // 2))
+
+        watch_rect = self.watch_rect
+        scene.rect("watch", (0, 0, 0), watch_rect)
+        watch_text = CACHE.label("Watch AIs", 35, (255, 255, 255), "comicsansms")
+        scene.blit("watch-label", watch_text, (watch_rect.centerx - watch_text.get_width() // 2, watch_rect.centery - watch_text.get_height() // 2))
+
+        scene.rect("howto", (0, 0, 0), howto_rect)
+        how_text = CACHE.label("How to Play", 35, (255, 255, 255), "comicsansms")
+        scene.blit("howto-label", how_text, (howto_rect.centerx - how_text.get_width() // 2, howto_rect.centery - how_text.get_height() // 2))
+
+        scene.rect("exit", (0, 0, 0), exit_rect)
+        exit_text = CACHE.label("Exit", 35, (255, 255, 255), "comicsansms")
+        scene.blit("exit-label", exit_text, (exit_rect.centerx - exit_text.get_width() // 2, exit_rect.centery - exit_text.get_height() // 2))
+
+    def handle(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.play_rect.collidepoint(event.pos):
+                self.app.switch(PlayerSelection(self.app))
+            elif self.watch_rect.collidepoint(event.pos):
+                self.app.switch(PlayerSelection(self.app, watch=True))
+            elif self.can_resume and self.resume_rect.collidepoint(event.pos):
+                try:
+                    self.app.switch(Game.resume(self.app))
+                except (OSError, ValueError) as error:
+                    print(f"could not resume the saved game: {error}")
+                    self.can_resume = False
+            elif self.howto_rect.collidepoint(event.pos):
+                self.app.switch(HowToPlay(self.app))
+            elif self.exit_rect.collidepoint(event.pos):
+                self.app.running = False
 
 # -------------------------
 # Player Selection
 # -------------------------
-def player_selection(screen, background, clock):
-    font = pygame.font.SysFont("comicsansms", 50)
-    input_str = ""
-
-    while True:
-        screen.blit(background, (0, 0))
-        text = font.render("Enter number of players (2–10):", True, (0, 0, 0))
-        screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-        input_text = font.render(input_str, True, (0, 0, 0))
-        screen.blit(input_text, (SCREEN_WIDTH // 2 - input_text.get_width() // 2, SCREEN_HEIGHT // 2))
-        pygame.display.flip()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN and input_str.isdigit():
-                    val = int(input_str)
-                    if 2 <= val <= 10:
-                        return tap_to_play(val, screen, background, clock)
-                elif event.key == pygame.K_BACKSPACE:
-                    input_str = input_str[:-1]
-                elif event.unicode.isdigit():
-                    input_str += event.unicode
-        clock.tick(30)
+class PlayerSelection(Screen):
+    def __init__(self, app, watch=False):
+        super().__init__(app)
+        self.input_str = ""
+        self.watch = watch  # spectate an AI-only game instead of playing
+
+    def draw(self, scene):
+        prompt = "Enter number of AI players (2–10):" if self.watch else "Enter number of players (2–10):"
+        text = CACHE.label(prompt, 50, (0, 0, 0), "comicsansms")
+        scene.blit("prompt", text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
+        input_text = CACHE.label(self.input_str, 50, (0, 0, 0), "comicsansms")
+        scene.blit("input", input_text, (SCREEN_WIDTH // 2 - input_text.get_width() // 2, SCREEN_HEIGHT // 2))
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN and self.input_str.isdigit():
+                val = int(self.input_str)
+                if 2 <= val <= 10 and self.watch:
+                    self.app.switch(Spectator(self.app, val))
+                elif 2 <= val <= 10:
+                    self.app.switch(TapToPlay(self.app, val))
+            elif event.key == pygame.K_BACKSPACE:
+                self.input_str = self.input_str[:-1]
+            elif event.unicode.isdigit():
+                self.input_str += event.unicode
 
 # -------------------------
 # Tap to Play Screen
 # -------------------------
-def tap_to_play(players, screen, background, clock):
-    font = pygame.font.SysFont("comicsansms", 70, bold=True)
-    blink_timer = 0
-    show_text = True
-    while True:
-        screen.blit(background, (0, 0))
-        if pygame.time.get_ticks() - blink_timer > 500:
-            show_text = not show_text
-            blink_timer = pygame.time.get_ticks()
-        if show_text:
-            text = font.render("Tap to Play", True, (0, 0, 0))
-            screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
-        pygame.display.flip()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                return Game(players).run()
-        clock.tick(30)
+class TapToPlay(Screen):
+    def __init__(self, app, players):
+        super().__init__(app)
+        self.players = players
+        self.shown_at = pygame.time.get_ticks()
+
+    def draw(self, scene):
+        if not blink(pygame.time.get_ticks() - self.shown_at, 500):
+            text = CACHE.label("Tap to Play", 70, (0, 0, 0), "comicsansms", bold=True)
+            scene.blit("tap", text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
+
+    def timeout(self, now):
+        return blink_timeout(now - self.shown_at, 500)
+
+    def handle(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            self.app.switch(Game(self.app, self.players))
+
+# -------------------------
+# Instrumentation
+# -------------------------
+def watch_hot_paths():
+    # Timed only while INSTRUMENTS is enabled (F4)
+    INSTRUMENTS.watch(Game, "update", "round")
+    INSTRUMENTS.watch(Spectator, "update", "round")
+    INSTRUMENTS.watch(Engine, "choose_play", "ai", inclusive=True)
+    INSTRUMENTS.watch(Player, "play_card", "ai", inclusive=True)
+    for policy in [Policy] + list(POLICIES.values()):
+        if "choose_row" in policy.__dict__:
+            INSTRUMENTS.watch(policy, "choose_row", "ai", inclusive=True)
+    INSTRUMENTS.watch(Engine, "place_card", "placement")
+    INSTRUMENTS.watch(Engine, "deal", "deal")
+    for screen in (Game, Spectator, MainMenu, HowToPlay, PlayerSelection, TapToPlay):
+        INSTRUMENTS.watch(screen, "draw", "draw")
+    for method in ("draw_rows", "draw_players", "draw_hand", "display_played_cards", "draw_row_choice",
+                   "display_game_over"):
+        INSTRUMENTS.watch(Game, method, "draw")
+    INSTRUMENTS.watch(Scene, "present", "present")
+    INSTRUMENTS.watch(App, "dispatch", "events")
+
+def startup_report(timings):
+    loads = ", ".join(f"{name} {ms:.1f}" for name, ms in CACHE.assets.load_ms.items())
+    return (f"startup: imports {timings['imports']:.1f} ms, init {timings['init']:.1f} ms, "
+            f"first frame {timings['first_frame']:.1f} ms, total {timings['total']:.1f} ms ({loads})")
+
+def main_menu():
+    watch_hot_paths()
+    if SHOW_PROFILE:
+        INSTRUMENTS.enable()
+    profiler = None
+    if PROFILE_PATH and PROFILER == "sample":
+        profiler = SamplingProfiler()
+        profiler.start()
+    elif PROFILE_PATH:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    app = App()
+    if WATCH_PLAYERS:
+        app.switch(Spectator(app, WATCH_PLAYERS))
+    app.run()
+
+    if isinstance(profiler, SamplingProfiler):
+        profiler.stop()
+        profiler.dump(PROFILE_PATH)
+    elif profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(PROFILE_PATH)
+    if INSTRUMENTS.totals:
+        print(INSTRUMENTS.report())
+    sys.exit()
 
 # -------------------------
 # Run the Game!
 # -------------------------
 if __name__ == "__main__":
-    main_menu()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play 6nimmt! against AI opponents.")
+    parser.add_argument("--ai", choices=sorted(POLICIES), default=AI_POLICY, help="policy for the AI players")
+    parser.add_argument("--fps", action="store_true", help="show the frame-time counter (F3 toggles)")
+    parser.add_argument("--log", default=None, help="append finished games to this game log")
+    parser.add_argument("--startup", action="store_true", help="report startup timings and quit")
+    parser.add_argument("--stats", action="store_true", help="show the per-phase timing overlay (F4 toggles)")
+    parser.add_argument("--profile", default=None, help="write a profile of the session to this file")
+    parser.add_argument("--profiler", choices=["cprofile", "sample"], default=PROFILER,
+                        help="cProfile stats (pstats) or collapsed stacks from a sampling profiler")
+    parser.add_argument("--session", default=SESSION_PATH, help="where an unfinished game is saved on quit")
+    parser.add_argument("--watch", type=int, default=None, metavar="PLAYERS",
+                        help="watch this many AIs play each other, with no human seat")
+    parser.add_argument("--speed", choices=["1", "10", "max"], default="1",
+                        help="spectator speed (1 / 2 / 3 switch while watching)")
+    args = parser.parse_args()
+    if args.watch is not None and not 2 <= args.watch <= 10:
+        parser.error("--watch needs 2 to 10 players")
+    AI_POLICY = args.ai
+    SHOW_FPS = args.fps
+    LOG_PATH = args.log
+    SHOW_PROFILE = args.stats
+    REPORT_STARTUP = args.startup
+    PROFILE_PATH = args.profile
+    PROFILER = args.profiler
+    SESSION_PATH = args.session
+    WATCH_PLAYERS = args.watch
+    WATCH_SPEED = None if args.speed == "max" else int(args.speed)
+    main_menu()
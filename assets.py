@@ -0,0 +1,90 @@
+import os
+import time
+
+import pygame
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "6nimmt")
+
+# -------------------------
+# Asset Manager
+# -------------------------
+class Assets: # Images and fonts loaded on first use and shared by every screen
+    def __init__(self, root=ASSET_DIR, cache_dir=CACHE_DIR):
+        self.root = root
+        self.cache_dir = cache_dir  # scaled copies of large images; None disables
+        self.images = {}
+        self.fonts = {}
+        self.font_paths = {}
+        self.load_ms = {}  # asset -> ms spent loading it
+
+    def path(self, name):
+        # Asset names use "/" on every OS
+        return os.path.join(self.root, *name.split("/"))
+
+    def image(self, name, size=None, alpha=False):
+        # Loaded, scaled and converted to the display format once; None if missing
+        key = (name, size, alpha)
+        if key in self.images:
+            return self.images[key]
+        start = time.perf_counter()
+        path = self.path(name)
+        image = None
+        if os.path.exists(path):
+            cached = self.cached_path(path, size) if size is not None and not alpha else None
+            if cached is not None and os.path.exists(cached):
+                image = pygame.image.load(cached)
+            else:
+                image = pygame.image.load(path)
+                if size is not None and image.get_size() != size:
+                    image = pygame.transform.scale(image, size)
+                    if cached is not None:
+                        self.save_cached(image, cached)
+            image = self.converted(image, alpha)
+        self.images[key] = image
+        self.load_ms[name] = self.load_ms.get(name, 0.0) + (time.perf_counter() - start) * 1000
+        return image
+
+    def cached_path(self, path, size):
+        # Decoding a large JPEG dominates startup; an uncompressed copy at
+        # the target size loads in a few ms. Keyed on the source's mtime.
+        if self.cache_dir is None:
+            return None
+        stat = os.stat(path)
+        base = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{base}-{size[0]}x{size[1]}-{int(stat.st_mtime)}-{stat.st_size}.bmp")
+
+    @staticmethod
+    def save_cached(image, cached):
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            pygame.image.save(image, cached)
+        except (OSError, pygame.error):
+            pass  # read-only home: just decode every time
+
+    @staticmethod
+    def converted(surface, alpha=False):
+        # convert() needs a display mode; headless callers keep the original
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def font_path(self, name, bold=False):
+        # The system font scan runs once, on the first named font
+        key = (name, bold)
+        if key not in self.font_paths:
+            start = time.perf_counter()
+            self.font_paths[key] = pygame.font.match_font(name, bold=bold) if name else None
+            self.load_ms[f"font:{name}"] = (time.perf_counter() - start) * 1000
+        return self.font_paths[key]
+
+    def font(self, name, size, bold=False):
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            path = self.font_path(name, bold)
+            font = pygame.font.Font(path, size)
+            if bold and path is None:
+                font.set_bold(True)  # no bold face found: embolden the default
+            self.fonts[key] = font
+        return font
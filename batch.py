@@ -0,0 +1,163 @@
+import time
+
+import numpy as np
+
+from engine import DECK_SIZE, HAND_SIZE, MAX_PENALTY, PENALTIES, ROW_LIMIT, ROWS
+
+PENALTY_TABLE = np.array(PENALTIES, dtype=np.int16)
+
+# -------------------------
+# Batch Result
+# -------------------------
+class BatchResult: # Per-player penalty statistics over all finished games
+    def __init__(self, scores, tricks, elapsed):
+        self.scores = scores  # (games, players) final penalty points
+        self.tricks = tricks  # (games,) tricks played per game
+        self.elapsed = elapsed
+
+    @property
+    def games(self):
+        return len(self.scores)
+
+    @property
+    def games_per_sec(self):
+        return self.games / self.elapsed if self.elapsed else float("inf")
+
+    def mean_penalty(self):
+        return self.scores.mean(axis=0)
+
+    def std_penalty(self):
+        return self.scores.std(axis=0)
+
+    def loss_rate(self):
+        # Share of games in which each player reached MAX_PENALTY
+        return (self.scores >= MAX_PENALTY).mean(axis=0)
+
+    def win_rate(self):
+        # Lowest score wins; ties split the win
+        best = self.scores.min(axis=1, keepdims=True)
+        winners = self.scores == best
+        return (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0)
+
+# -------------------------
+# Batch Simulator
+# -------------------------
+class BatchSimulator: # N games of random AIs resolved in lockstep
+    def __init__(self, batch_size, player_count, rng=None):
+        self.n = batch_size
+        self.players = player_count
+        self.hand_size = min(HAND_SIZE, (DECK_SIZE - ROWS) // player_count)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.scores = np.zeros((self.n, player_count), dtype=np.int16)
+        self.tricks = np.zeros(self.n, dtype=np.int32)
+        self.active = np.ones(self.n, dtype=bool)
+        self.index = np.arange(self.n)
+
+    def deal(self):
+        # Every game gets a fresh shuffle; hands keep their shuffled order,
+        # so playing them left to right is a uniformly random choice.
+        deck = np.argsort(self.rng.random((self.n, DECK_SIZE)), axis=1).astype(np.int16) + 1
+        dealt = self.players * self.hand_size
+        self.hands = deck[:, :dealt].reshape(self.n, self.players, self.hand_size)
+        starters = deck[:, dealt:dealt + ROWS]
+        self.tails = starters.copy()
+        self.lengths = np.ones((self.n, ROWS), dtype=np.int8)
+        self.row_penalties = PENALTY_TABLE[starters]
+
+    def take(self, mask, rows, players, cards):
+        idx = self.index[mask]
+        rows = rows[mask]
+        self.scores[idx, players[mask]] += self.row_penalties[idx, rows]
+        self.tails[idx, rows] = cards[mask]
+        self.lengths[idx, rows] = 1
+        self.row_penalties[idx, rows] = PENALTY_TABLE[cards[mask]]
+
+    def play_trick(self, t):
+        played = self.hands[:, :, t]
+        order = np.argsort(played, axis=1)
+        cards_sorted = np.take_along_axis(played, order, axis=1)
+        for k in range(self.players):
+            cards = cards_sorted[:, k]
+            players = order[:, k]
+            # Nearest lower row: smallest positive gap to a row tail
+            gaps = cards[:, None].astype(np.int32) - self.tails
+            gaps[gaps <= 0] = DECK_SIZE + 1
+            target = gaps.argmin(axis=1)
+            fits = gaps[self.index, target] <= DECK_SIZE
+
+            full = fits & (self.lengths[self.index, target] >= ROW_LIMIT) & self.active
+            append = fits & ~full & self.active
+            # Too low for every row: take the cheapest row
+            too_low = ~fits & self.active
+            cheapest = self.row_penalties.argmin(axis=1)
+
+            self.take(full, target, players, cards)
+            self.take(too_low, cheapest, players, cards)
+
+            idx = self.index[append]
+            rows = target[append]
+            self.tails[idx, rows] = cards[append]
+            self.lengths[idx, rows] += 1
+            self.row_penalties[idx, rows] += PENALTY_TABLE[cards[append]]
+        self.tricks += self.active
+        self.active &= self.scores.max(axis=1) < MAX_PENALTY
+
+    def run(self, games):
+        # Every slot starts a game; finished slots start new ones until
+        # `games` have been started, then idle while the rest play out.
+        # Keeping every started game (long ones included) avoids favouring
+        # the games that happen to end first.
+        finished_scores = []
+        finished_tricks = []
+        started = self.n
+        running = np.ones(self.n, dtype=bool)  # slot holds an unharvested game
+        start = time.perf_counter()
+        while running.any():
+            self.deal()
+            for t in range(self.hand_size):
+                self.play_trick(t)
+                if not self.active.any():
+                    break
+            # Harvest finished games and restart slots at the next deal
+            over = running & ~self.active
+            if over.any():
+                finished_scores.append(self.scores[over].copy())
+                finished_tricks.append(self.tricks[over].copy())
+                slots = self.index[over]
+                restart = slots[:max(games - started, 0)]
+                started += len(restart)
+                running[slots[len(restart):]] = False
+                self.scores[restart] = 0
+                self.tricks[restart] = 0
+                self.active[restart] = True
+        elapsed = time.perf_counter() - start
+        return BatchResult(np.concatenate(finished_scores), np.concatenate(finished_tricks), elapsed)
+
+def simulate(games, player_count, batch_size=4096, seed=None):
+    rng = np.random.default_rng(seed)
+    sim = BatchSimulator(min(batch_size, games), player_count, rng)
+    return sim.run(games)
+
+# -------------------------
+# Run a batch from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate many 6nimmt! games in lockstep with NumPy.")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    result = simulate(args.games, args.players, args.batch_size, args.seed)
+    means = result.mean_penalty()
+    stds = result.std_penalty()
+    wins = result.win_rate()
+    losses = result.loss_rate()
+    for i in range(args.players):
+        print(f"AI{i + 1}: mean penalty {means[i]:.2f} (sd {stds[i]:.2f}), "
+              f"win {wins[i]:.1%}, lose {losses[i]:.1%}")
+    print(f"mean game length {result.tricks.mean():.1f} tricks")
+    print(f"{result.games} games in {result.elapsed:.2f}s ({result.games_per_sec:,.0f} games/sec)")
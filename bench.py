@@ -0,0 +1,254 @@
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from engine import DECK_SIZE, PENALTIES, Engine, Player, get_bull_heads
+from policies import POLICIES, MonteCarloPolicy, make_policy
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+TOLERANCE = 0.3  # a metric this much worse than its baseline is a regression
+NOISE_FLOOR_MS = 0.01  # latencies below this are timer noise, never regressions
+
+# -------------------------
+# Results
+# -------------------------
+class Results: # Named metrics, each with a unit and which direction is better
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, value, unit, higher_is_better, gated=True):
+        # Ungated metrics are reported but too noisy to fail a comparison
+        self.metrics[name] = {"value": round(value, 6), "unit": unit, "higher_is_better": higher_is_better,
+                              "gated": gated}
+        print(f"{name:<40} {value:>14,.3f} {unit}", flush=True)
+
+    def rate(self, name, count, elapsed, unit="ops/sec"):
+        self.add(name, count / elapsed, unit, True)
+
+    def latency(self, name, samples_ms):
+        ordered = sorted(samples_ms)
+        for label, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            self.add(f"{name}.{label}", ordered[min(int(q * len(ordered)), len(ordered) - 1)], "ms", False,
+                     gated=label == "p50")
+
+    def to_json(self):
+        return {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "metrics": self.metrics,
+        }
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return time.perf_counter() - start
+
+# -------------------------
+# Rules Benchmarks
+# -------------------------
+def bench_cards(results, scale):
+    # Cards are plain ints: scoring is get_bull_heads or the PENALTIES table
+    cards = range(1, DECK_SIZE + 1)
+    rounds = 2000 * scale
+    elapsed = timed(lambda: [get_bull_heads(card) for card in cards], rounds)
+    results.rate("cards.get_bull_heads", rounds * DECK_SIZE, elapsed)
+    elapsed = timed(lambda: [PENALTIES[card] for card in cards], rounds)
+    results.rate("cards.penalty_lookup", rounds * DECK_SIZE, elapsed)
+
+def bench_placement(results, scale):
+    # Each deal places every card not on the table once, in random order,
+    # so no row ever holds a card twice; only the placements are timed
+    rng = random.Random(1)
+    players = [Player("AI1")]
+    engine = Engine(players, rng)
+    placed = 0
+    elapsed = 0.0
+    for _ in range(2000 * scale):
+        engine.deal()
+        cards = players[0].hand + engine.deck
+        rng.shuffle(cards)
+        start = time.perf_counter()
+        for card in cards:
+            engine.place_card(players[0], card)
+        elapsed += time.perf_counter() - start
+        placed += len(cards)
+    results.rate("engine.place_card", placed, elapsed)
+
+def bench_games(results, scale):
+    rng = random.Random(2)
+    for player_count in range(2, 11):
+        games = 300 * scale
+        players = [Player(f"AI{i}") for i in range(player_count)]
+        start = time.perf_counter()
+        for _ in range(games):
+            for player in players:
+                player.penalty_points = 0
+            Engine(players, rng).play_to_end()
+        results.rate(f"games.{player_count}p", games * 60, time.perf_counter() - start, "games/min")
+
+def bench_deal(results, scale):
+    engine = Engine([Player(f"AI{i}") for i in range(4)], random.Random(3))
+    deals = 5000 * scale
+    elapsed = timed(engine.deal, deals)
+    results.add("engine.deal", elapsed / deals * 1e6, "us", False)
+
+def bench_policies(results, scale, montecarlo_budget):
+    rng = random.Random(4)
+    for name in sorted(POLICIES):
+        if name == MonteCarloPolicy.name:
+            policy = MonteCarloPolicy(time_budget=montecarlo_budget, seed=4)
+            decisions = 10 * scale
+        else:
+            policy = make_policy(name)
+            decisions = 2000 * scale
+        samples = []
+        while len(samples) < decisions:
+            players = [Player("AI1", policy=policy)] + [Player(f"AI{i}") for i in range(2, 5)]
+            engine = Engine(players, rng)
+            while not engine.hands_empty() and len(samples) < decisions:
+                start = time.perf_counter()
+                policy.choose_card(engine, players[0])
+                samples.append((time.perf_counter() - start) * 1000)
+                engine.resolve_trick(engine.collect_plays())
+        results.latency(f"policy.{name}.choose_card", samples)
+
+# -------------------------
+# Rendering Benchmarks
+# -------------------------
+def bench_render(results, scale):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    try:
+        import pygame  # noqa: F401
+    except ImportError:
+        print("rendering: skipped (pygame not installed)")
+        return
+    from render import load_game_module
+    nimmt = load_game_module()
+    app = nimmt.App()
+    game = nimmt.Game(app, 10)
+    plays = [(card, player) for card, player in zip(range(1, 11), game.players)]
+    frames = 200 * scale
+    draws = {
+        "draw_rows": game.draw_rows,
+        "draw_hand": lambda: game.draw_hand(game.players[0], 10),
+        "display_played_cards": lambda: game.display_played_cards(plays),
+    }
+    for name, draw in draws.items():
+        # Full repaints: the cost when everything on screen changes
+        samples = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            app.scene.invalidate()
+            app.scene.begin()
+            draw()
+            app.scene.commit()
+            samples.append((time.perf_counter() - start) * 1000)
+        results.latency(f"render.{name}.full", samples)
+    samples = []
+    for _ in range(frames):
+        # A whole unchanged game frame: only the dirty-rect diff is paid
+        start = time.perf_counter()
+        app.scene.begin()
+        game.draw(app.scene)
+        app.scene.commit()
+        samples.append((time.perf_counter() - start) * 1000)
+    results.latency("render.game_frame.idle", samples)
+    pygame.quit()
+
+def bench_startup(results, scale):
+    # Cold starts in fresh processes; the first run may also fill the
+    # scaled-image cache, so the median of several runs is reported.
+    import re
+    import subprocess
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "6nimmt.py")
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy")
+    runs = {}
+    for _ in range(3 * scale):
+        output = subprocess.run([sys.executable, path, "--startup"], env=env, capture_output=True, text=True)
+        match = re.search(r"imports ([\d.]+) ms, init ([\d.]+) ms, first frame ([\d.]+) ms, total ([\d.]+) ms",
+                          output.stdout)
+        if match is None:
+            print("startup: skipped (game did not start)")
+            return
+        for name, value in zip(("imports", "init", "first_frame", "total"), match.groups()):
+            runs.setdefault(name, []).append(float(value))
+    for name, values in runs.items():
+        # Imports are dominated by pygame itself, so only our own work is gated
+        results.add(f"startup.{name}", sorted(values)[len(values) // 2], "ms", False,
+                    gated=name in ("init", "first_frame"))
+
+# -------------------------
+# Baselines
+# -------------------------
+def compare(results, baseline, tolerance=TOLERANCE):
+    # Names of metrics that got worse than the baseline by more than `tolerance`
+    regressions = []
+    for name, metric in results.metrics.items():
+        base = baseline["metrics"].get(name)
+        if base is None or not base["value"] or not metric["gated"]:
+            continue
+        if metric["unit"] == "ms" and max(metric["value"], base["value"]) < NOISE_FLOOR_MS:
+            continue
+        change = metric["value"] / base["value"] - 1
+        worse = -change if metric["higher_is_better"] else change
+        if worse > tolerance:
+            regressions.append(name)
+            print(f"REGRESSION {name}: {base['value']:,.3f} -> {metric['value']:,.3f} {metric['unit']} "
+                  f"({worse:.0%} worse)")
+    return regressions
+
+SUITES = {
+    "cards": bench_cards,
+    "placement": bench_placement,
+    "games": bench_games,
+    "deal": bench_deal,
+    "policies": bench_policies,
+    "render": bench_render,
+    "startup": bench_startup,
+}
+
+# -------------------------
+# Run the benchmarks from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark 6nimmt! rules, AI and rendering hot paths.")
+    parser.add_argument("--only", default=",".join(SUITES), help="comma-separated suites to run")
+    parser.add_argument("--scale", type=int, default=1, help="multiply the iteration counts")
+    parser.add_argument("--montecarlo-budget", type=float, default=0.2, help="seconds per Monte Carlo decision")
+    parser.add_argument("--json", default=None, help="write results to this file ('-' for stdout)")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    results = Results()
+    for name in args.only.split(","):
+        suite = SUITES[name.strip()]
+        if suite is bench_policies:
+            suite(results, args.scale, args.montecarlo_budget)
+        else:
+            suite(results, args.scale)
+
+    if args.json == "-":
+        json.dump(results.to_json(), sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(results.to_json(), f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results.to_json(), f, indent=2)
+            f.write("\n")
+        print(f"baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        print(f"{len(regressions)} regressions against {args.baseline}")
+        sys.exit(1 if regressions else 0)
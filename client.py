@@ -0,0 +1,177 @@
+import asyncio
+import json
+import time
+
+from engine import row_penalty
+from server import PORT, percentile
+
+# -------------------------
+# Client
+# -------------------------
+class Client: # One seat's connection to a GameServer
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=PORT):
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 16)
+        return cls(reader, writer)
+
+    async def send(self, message):
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        await self.writer.drain()
+
+    async def receive(self):
+        # Next server message, or None once the server hangs up
+        line = await self.reader.readline()
+        return json.loads(line) if line else None
+
+    async def join(self, table, name, players=4, humans=1, ai="random"):
+        await self.send({"type": "join", "table": table, "name": name,
+                         "players": players, "humans": humans, "ai": ai})
+        return await self.receive()
+
+    async def play(self, card):
+        await self.send({"type": "play", "card": card})
+
+    async def take_row(self, row):
+        await self.send({"type": "row", "row": row})
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+def cheapest_row(message):
+    # Same choice as the server's auto-play: fewest bull heads
+    penalties = [row_penalty(row) for row in message["rows"]]
+    return penalties.index(min(penalties))
+
+async def play_bot(client, choose_card=min, choose_row=cheapest_row, latencies=None):
+    # Answers every prompt until the game ends; returns the final scores.
+    # `latencies` collects ms from sending a card to seeing the trick.
+    sent = None
+    while True:
+        message = await client.receive()
+        if message is None:
+            return None
+        kind = message["type"]
+        if kind == "select":
+            sent = time.perf_counter()
+            await client.play(choose_card(message["hand"]))
+        elif kind == "choose_row":
+            await client.take_row(choose_row(message))
+        elif kind == "trick" and sent is not None:
+            if latencies is not None:
+                latencies.append((time.perf_counter() - sent) * 1000)
+            sent = None
+        elif kind == "game_over":
+            return message["scores"]
+        elif kind == "error":
+            raise RuntimeError(message["message"])
+
+# -------------------------
+# Terminal Player
+# -------------------------
+async def read_line(prompt):
+    return await asyncio.get_running_loop().run_in_executor(None, input, prompt)
+
+async def ask_number(prompt, valid):
+    while True:
+        answer = await read_line(prompt)
+        if answer.strip().isdigit() and valid(int(answer)):
+            return int(answer)
+        print("Invalid choice.")
+
+async def play_terminal(client):
+    # Play one seat by typing card and row numbers. The server still
+    # enforces the selection time, so a slow answer may already be auto-played.
+    players = []
+    while True:
+        message = await client.receive()
+        if message is None:
+            return
+        kind = message["type"]
+        if kind == "deal":
+            players = message["players"]
+            print("New deal.")
+        elif kind == "select":
+            for i, row in enumerate(message["rows"]):
+                print(f"Row {i}: {row}")
+            hand = message["hand"]
+            print(f"Your hand: {hand}  ({message['timeout']:.0f}s)")
+            await client.play(await ask_number("Card to play: ", lambda card: card in hand))
+        elif kind == "choose_row":
+            for i, row in enumerate(message["rows"]):
+                print(f"Row {i}: {row}")
+            rows = len(message["rows"])
+            await client.take_row(await ask_number(f"{message['card']} is lowest, row to take: ",
+                                                   lambda row: 0 <= row < rows))
+        elif kind == "trick":
+            print("Played: " + ", ".join(f"{players[player]} {card}" for card, player in message["plays"]))
+            print("Scores: " + ", ".join(f"{name} {score}" for name, score in zip(players, message["scores"])))
+        elif kind == "game_over":
+            scores = message["scores"]
+            print("GAME OVER")
+            for name, score in sorted(zip(players, scores), key=lambda item: item[1]):
+                print(f"{name}: {score} points")
+            return
+        elif kind == "error":
+            print(f"Server: {message['message']}")
+
+# -------------------------
+# Play or load-test from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Connect to a 6nimmt! server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--table", default="default")
+    parser.add_argument("--name", default="You")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--humans", type=int, default=1)
+    parser.add_argument("--ai", default="random")
+    parser.add_argument("--bots", type=int, default=0,
+                        help="load test: fill this many tables with bot clients instead of playing")
+    args = parser.parse_args()
+
+    async def load_test():
+        latencies = []
+
+        async def bot(table, seat):
+            client = await Client.connect(args.host, args.port)
+            joined = await client.join(table, f"Bot{seat}", args.players, args.humans, args.ai)
+            if joined["type"] != "joined":
+                raise RuntimeError(joined["message"])
+            try:
+                return await play_bot(client, latencies=latencies)
+            finally:
+                await client.close()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bot(f"{args.table}-{i}", seat)
+                               for i in range(args.bots) for seat in range(args.humans)))
+        elapsed = time.perf_counter() - start
+        print(f"{args.bots} tables ({args.bots * args.humans} clients) in {elapsed:.2f}s "
+              f"({args.bots / elapsed:,.1f} games/sec)")
+        print(f"card -> trick latency p50 {percentile(latencies, 0.5):.2f} ms, "
+              f"p99 {percentile(latencies, 0.99):.2f} ms over {len(latencies):,} tricks")
+
+    async def main():
+        client = await Client.connect(args.host, args.port)
+        joined = await client.join(args.table, args.name, args.players, args.humans, args.ai)
+        if joined["type"] != "joined":
+            print(joined["message"])
+            return
+        print(f"Joined table {joined['table']} as seat {joined['seat']}, waiting for players...")
+        try:
+            await play_terminal(client)
+        finally:
+            await client.close()
+
+    asyncio.run(load_test() if args.bots else main())
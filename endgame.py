@@ -0,0 +1,294 @@
+import itertools
+import sys
+from collections import OrderedDict
+
+from engine import PENALTIES, ROW_LIMIT
+
+# -------------------------
+# Bounded LRU Cache
+# -------------------------
+class LRUCache: # Transposition table with hit/miss counters
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def memory_bytes(self, seen=None):
+        # Walks every entry, so call it for reporting, not per lookup.
+        # Objects shared between entries are counted once.
+        seen = set() if seen is None else seen
+        return sys.getsizeof(self.entries) + sum(
+            deep_size(key, seen) + deep_size(value, seen) for key, value in self.entries.items())
+
+def deep_size(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list)):
+        size += sum(deep_size(item, seen) for item in obj)
+    return size
+
+# -------------------------
+# Endgame Solver
+# -------------------------
+# Rows are tuples of (tail, length, penalty): that is all that matters for
+# later placements. Hands are tuples of sorted card tuples, one per seat.
+#
+# The value of a position is the penalty the solving seat (`me`) expects to
+# take over the rest of the deal, when it plays optimally (card and row
+# choice) and every opponent plays a uniformly random card and takes the
+# cheapest row, as the built-in AI does.
+
+class EndgameSolver:
+    def __init__(self, max_tricks=3, capacity=50000):
+        self.max_tricks = max_tricks
+        self.tricks = LRUCache(capacity)  # (rows, plays) -> outcomes
+        self.values = LRUCache(capacity)  # (rows, hands, me) -> (value, card)
+        self.deal = None  # starters of the deal the tables hold positions from
+
+    # -------------------------
+    # Trick Resolution
+    # -------------------------
+    def last_trick(self, rows, card, others):
+        # Penalty for `card` in the deal's final trick. Only lower cards are
+        # placed before it and nothing after it matters, so no states are built.
+        tails = [row[0] for row in rows]
+        lengths = [row[1] for row in rows]
+        penalties = [row[2] for row in rows]
+        for other in sorted(other for other in others if other < card):
+            best = 0
+            target = None
+            for i, tail in enumerate(tails):
+                if best < tail < other:
+                    best = tail
+                    target = i
+            if target is not None and lengths[target] < ROW_LIMIT:
+                tails[target] = other
+                lengths[target] += 1
+                penalties[target] += PENALTIES[other]
+                continue
+            if target is None:
+                target = penalties.index(min(penalties))
+            tails[target] = other
+            lengths[target] = 1
+            penalties[target] = PENALTIES[other]
+        best = 0
+        target = None
+        for i, tail in enumerate(tails):
+            if best < tail < card:
+                best = tail
+                target = i
+        if target is None:
+            return min(penalties)
+        return penalties[target] if lengths[target] >= ROW_LIMIT else 0
+
+    def resolve_uncached(self, rows, plays):
+        # All (rows after the trick, penalty to me) outcomes. Works on plain
+        # lists and only builds row tuples for the final states.
+        outcomes = []
+        self.place_from(plays, 0, [row[0] for row in rows], [row[1] for row in rows],
+                        [row[2] for row in rows], 0, outcomes)
+        return outcomes
+
+    def place_from(self, plays, pos, tails, lengths, penalties, taken, outcomes):
+        for pos in range(pos, len(plays)):
+            card, mine = plays[pos]
+            best = 0
+            target = None
+            for i, tail in enumerate(tails):
+                if best < tail < card:
+                    best = tail
+                    target = i
+            if target is not None and lengths[target] < ROW_LIMIT:
+                tails[target] = card
+                lengths[target] += 1
+                penalties[target] += PENALTIES[card]
+                continue
+            if target is None:
+                if mine:
+                    # Too low: we may take any row, so branch on each
+                    for i in range(len(tails)):
+                        branch_tails, branch_lengths, branch_penalties = tails[:], lengths[:], penalties[:]
+                        branch_tails[i] = card
+                        branch_lengths[i] = 1
+                        branch_penalties[i] = PENALTIES[card]
+                        self.place_from(plays, pos + 1, branch_tails, branch_lengths, branch_penalties,
+                                        taken + penalties[i], outcomes)
+                    return
+                # Opponents take the cheapest row
+                target = penalties.index(min(penalties))
+            elif mine:
+                taken += penalties[target]
+            tails[target] = card
+            lengths[target] = 1
+            penalties[target] = PENALTIES[card]
+        outcomes.append((tuple(zip(tails, lengths, penalties)), taken))
+
+    def resolve(self, rows, plays):
+        # `plays` is a sorted tuple of (card, mine) pairs
+        key = (rows, plays)
+        outcomes = self.tricks.get(key)
+        if outcomes is None:
+            outcomes = self.resolve_uncached(rows, plays)
+            self.tricks.put(key, outcomes)
+        return outcomes
+
+    # -------------------------
+    # Search
+    # -------------------------
+    def solve(self, rows, hands, me):
+        # Returns (expected penalty for `me`, best card to play)
+        if not hands[me]:
+            return 0.0, None
+        if len(hands[me]) == 1:
+            # Last trick is forced; it would only churn the caches
+            card = hands[me][0]
+            others = [hand[0] for seat, hand in enumerate(hands) if seat != me and hand]
+            return self.last_trick(rows, card, others), card
+        key = (rows, hands, me)
+        cached = self.values.get(key)
+        if cached is not None:
+            return cached
+        best = None
+        for card, value in self.card_values(rows, hands, me).items():
+            if best is None or value < best[0]:
+                best = (value, card)
+        self.values.put(key, best)
+        return best
+
+    def card_values(self, rows, hands, me):
+        # Expected penalty for `me` after playing each card in its hand
+        opponents = [seat for seat in range(len(hands)) if seat != me and hands[seat]]
+        # Each opponent choice as (play, seat, hand left after playing it)
+        choices = [[((other, False), seat, tuple(c for c in hands[seat] if c != other))
+                    for other in hands[seat]] for seat in opponents]
+        combos = list(itertools.product(*choices))
+        values = {}
+        for card in hands[me]:
+            total = 0.0
+            mine = (card, True)
+            next_hands = list(hands)
+            next_hands[me] = tuple(c for c in hands[me] if c != card)
+            for combo in combos:
+                plays = [mine]
+                for play, seat, rest in combo:
+                    plays.append(play)
+                    next_hands[seat] = rest
+                plays.sort()
+                after = tuple(next_hands)
+                outcomes = self.resolve(rows, tuple(plays))
+                if len(outcomes) == 1:
+                    state, taken = outcomes[0]
+                    total += taken + self.solve(state, after, me)[0]
+                else:
+                    total += min(taken + self.solve(state, after, me)[0] for state, taken in outcomes)
+            values[card] = total / len(combos)
+        return values
+
+    def row_values(self, rows, remaining, hands, me, card):
+        # Expected penalty for `me` after taking each row with a too-low
+        # `card`, given the sorted (card, mine) plays still to be placed.
+        values = {}
+        for i in range(len(rows)):
+            taken = rows[i][2]
+            state = rows[:i] + ((card, 1, PENALTIES[card]),) + rows[i + 1:]
+            values[i] = taken + min(extra + self.solve(after, hands, me)[0]
+                                    for after, extra in self.resolve(state, remaining))
+        return values
+
+    # -------------------------
+    # Engine Glue and Stats
+    # -------------------------
+    def can_solve(self, engine):
+        # The solver hard-codes the classic row limit and scoring
+        table = engine.table
+        if table.row_limit != ROW_LIMIT or table.scores is not PENALTIES:
+            return False
+        return 0 < engine.tricks_left <= self.max_tricks
+
+    def start_deal(self, engine):
+        # Positions from one deal never come up in the next, so the tables
+        # are emptied whenever the engine is on a deal we have not seen
+        deal = tuple(engine.starters)
+        if deal != self.deal:
+            self.clear()
+            self.deal = deal
+
+    @staticmethod
+    def rows_of(engine):
+        table = engine.table
+        return tuple(zip(table.tails, table.lengths, table.penalties))
+
+    @staticmethod
+    def hands_of(players):
+        return tuple(tuple(sorted(player.hand)) for player in players)
+
+    def clear(self):
+        self.tricks.clear()
+        self.values.clear()
+
+    def stats(self):
+        seen = set()
+        return {
+            "trick_entries": len(self.tricks.entries),
+            "trick_hit_rate": self.tricks.hit_rate,
+            "value_entries": len(self.values.entries),
+            "value_hit_rate": self.values.hit_rate,
+            "memory_bytes": self.tricks.memory_bytes(seen) + self.values.memory_bytes(seen),
+        }
+
+# -------------------------
+# Solve random endgames from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+    import random
+    import time
+
+    from engine import Engine, Player
+
+    parser = argparse.ArgumentParser(description="Exactly solve the last tricks of random 6nimmt! deals.")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--tricks", type=int, default=3)
+    parser.add_argument("--positions", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    solver = EndgameSolver(max_tricks=args.tricks)
+    start = time.perf_counter()
+    for _ in range(args.positions):
+        engine = Engine([Player(f"AI{i + 1}") for i in range(args.players)], rng)
+        while engine.tricks_left > args.tricks:
+            engine.resolve_trick(engine.collect_plays())
+        value, card = solver.solve(solver.rows_of(engine), solver.hands_of(engine.players), 0)
+    elapsed = time.perf_counter() - start
+    print(f"{args.positions} positions in {elapsed:.2f}s ({elapsed / args.positions * 1000:.1f} ms each)")
+    for name, value in solver.stats().items():
+        print(f"{name}: {value:.3f}" if isinstance(value, float) else f"{name}: {value:,}")
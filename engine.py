@@ -0,0 +1,467 @@
+import random
+from bisect import bisect_left
+
+# -------------------------
+# Rules Constants
+# -------------------------
+DECK_SIZE = 104
+HAND_SIZE = 10
+ROWS = 4
+ROW_LIMIT = 5  # the 6th card takes the row
+SELECTION_TIME = 15
+MAX_PENALTY = 64
+MAX_CARD = 255  # largest card number any deck variant may use
+
+BULL_HEADS = {55: 7, 5: 2, 10: 3, 1: 1}
+
+def get_bull_heads(card_number):
+    if card_number in BULL_HEADS:
+        return BULL_HEADS[card_number]
+    elif card_number % 11 == 0:
+        return 5
+    elif card_number % 10 == 0:
+        return 3
+    elif card_number % 5 == 0:
+        return 2
+    else:
+        return 1
+
+def one_per_card(card_number):
+    return 1
+
+PENALTIES = [0] + [get_bull_heads(n) for n in range(1, MAX_CARD + 1)]
+SCORING = {"bull_heads": get_bull_heads, "flat": one_per_card}
+
+def row_penalty(row):
+    return sum([PENALTIES[card] for card in row])
+
+# -------------------------
+# Rules
+# -------------------------
+class Rules: # One rule set; the constants above are the classic game
+    def __init__(self, deck_size=DECK_SIZE, hand_size=HAND_SIZE, rows=ROWS, row_limit=ROW_LIMIT,
+                 max_penalty=MAX_PENALTY, selection_time=SELECTION_TIME, scoring="bull_heads"):
+        if not rows < deck_size <= MAX_CARD:
+            raise ValueError(f"deck_size must be between {rows + 1} and {MAX_CARD}, got {deck_size}")
+        if hand_size < 1 or rows < 1 or row_limit < 1 or max_penalty < 1 or selection_time <= 0:
+            raise ValueError("hand_size, rows, row_limit, max_penalty and selection_time must be positive")
+        if scoring not in SCORING:
+            raise ValueError(f"Unknown scoring {scoring!r}, expected one of: {', '.join(SCORING)}")
+        self.deck_size = deck_size
+        self.hand_size = hand_size
+        self.rows = rows
+        self.row_limit = row_limit
+        self.max_penalty = max_penalty
+        self.selection_time = selection_time  # seconds a human gets to pick a card or row
+        self.scoring = scoring
+        # Indexed by card number, like PENALTIES
+        self.penalties = PENALTIES if scoring == "bull_heads" else \
+            [0] + [SCORING[scoring](n) for n in range(1, MAX_CARD + 1)]
+
+    @classmethod
+    def tactics(cls, player_count, **options):
+        # Tactical variant: only cards 1..players * hand + rows are used, so
+        # every card is in play and nothing stays hidden in the deck
+        deck_size = player_count * options.get("hand_size", HAND_SIZE) + options.get("rows", ROWS)
+        return cls(**dict(options, deck_size=deck_size))
+
+    def hand_size_for(self, player_count):
+        # Big tables get smaller hands when the deck runs short
+        return min(self.hand_size, (self.deck_size - self.rows) // player_count)
+
+    def is_classic(self):
+        # The selection time is ignored: it never changes how a game plays out
+        return (self.deck_size, self.hand_size, self.rows, self.row_limit, self.max_penalty, self.scoring) == \
+            (DECK_SIZE, HAND_SIZE, ROWS, ROW_LIMIT, MAX_PENALTY, "bull_heads")
+
+    def check_players(self, player_count):
+        if player_count < 1 or self.hand_size_for(player_count) < 1:
+            raise ValueError(f"A {self.deck_size}-card deck with {self.rows} rows cannot seat {player_count} players")
+
+RULES = Rules()
+
+# -------------------------
+# Player Class
+# -------------------------
+class Player: # Cards are plain ints, no pygame objects
+    def __init__(self, name, is_human=False, policy=None):
+        self.name = name
+        self.hand = []
+        self.penalty_points = 0
+        self.is_human = is_human
+        self.selected_card = None
+        self.policy = policy  # None plays a random card
+
+    def play_card(self, rng=random):
+        if self.is_human:
+            if self.selected_card:
+                card = self.selected_card
+                self.selected_card = None
+                return card
+            return None
+        else:
+            if self.hand:
+                return self.hand.pop(int(rng.random() * len(self.hand)))
+        return None
+
+    def play_lowest(self):
+        # Used when the selection timer runs out
+        card = min(self.hand)
+        self.hand.remove(card)
+        return card
+
+    def copy(self):
+        player = Player.__new__(Player)
+        player.name = self.name
+        player.hand = self.hand[:]
+        player.penalty_points = self.penalty_points
+        player.is_human = self.is_human
+        player.selected_card = self.selected_card
+        player.policy = self.policy
+        return player
+
+# -------------------------
+# Table Class
+# -------------------------
+class Table: # Rows as fixed-size int arrays with running aggregates
+    __slots__ = ("row_limit", "scores", "cards", "lengths", "tails", "penalties", "order", "order_rows")
+
+    def __init__(self, starters=(), row_limit=ROW_LIMIT, scores=PENALTIES):
+        # Row i occupies cards[i * row_limit:(i + 1) * row_limit]. Any number
+        # of rows works; `order` keeps the row tails sorted (with their row
+        # in `order_rows`) so finding a card's row is one bisect.
+        self.row_limit = row_limit
+        self.scores = scores  # penalty of each card number
+        self.cards = [0] * (len(starters) * row_limit)
+        self.lengths = [1] * len(starters)
+        self.tails = list(starters)
+        self.penalties = [scores[card] for card in starters]
+        for i, card in enumerate(starters):
+            self.cards[i * row_limit] = card
+        self.order = sorted(self.tails)
+        self.order_rows = [self.tails.index(card) for card in self.order]
+
+    @classmethod
+    def from_rows(cls, rows, row_limit=ROW_LIMIT, scores=PENALTIES):
+        # Rebuild a table mid-deal from its rows (lists of cards)
+        table = cls([row[0] for row in rows], row_limit, scores)
+        for i, row in enumerate(rows):
+            for card in row[1:]:
+                table.append(i, card)
+        return table
+
+    def row(self, i):
+        start = i * self.row_limit
+        return self.cards[start:start + self.lengths[i]]
+
+    def rows(self):
+        return [self.row(i) for i in range(len(self.tails))]
+
+    def target(self, card):
+        # Row whose tail is the closest below `card`, or None if too low
+        pos = bisect_left(self.order, card)
+        return self.order_rows[pos - 1] if pos else None
+
+    def row_cost(self, i):
+        return self.penalties[i]
+
+    def cheapest(self):
+        penalties = self.penalties
+        return penalties.index(min(penalties))
+
+    def set_tail(self, i, card):
+        old = self.tails[i]
+        self.tails[i] = card
+        pos = bisect_left(self.order, old)
+        if (pos == 0 or self.order[pos - 1] < card) and (pos + 1 == len(self.order) or card < self.order[pos + 1]):
+            # Appends and 6th-card takes never pass another tail: swap in place
+            self.order[pos] = card
+            return
+        del self.order[pos]
+        del self.order_rows[pos]
+        pos = bisect_left(self.order, card)
+        self.order.insert(pos, card)
+        self.order_rows.insert(pos, i)
+
+    def append(self, i, card):
+        self.cards[i * self.row_limit + self.lengths[i]] = card
+        self.lengths[i] += 1
+        self.penalties[i] += self.scores[card]
+        self.set_tail(i, card)
+
+    def reset(self, i, card):
+        # Replace row i with `card`; returns the penalty of the old row
+        penalty = self.penalties[i]
+        self.cards[i * self.row_limit] = card
+        self.lengths[i] = 1
+        self.penalties[i] = self.scores[card]
+        self.set_tail(i, card)
+        return penalty
+
+    def copy(self):
+        table = Table.__new__(Table)
+        table.row_limit = self.row_limit
+        table.scores = self.scores
+        table.cards = self.cards[:]
+        table.lengths = self.lengths[:]
+        table.tails = self.tails[:]
+        table.penalties = self.penalties[:]
+        table.order = self.order[:]
+        table.order_rows = self.order_rows[:]
+        return table
+
+# -------------------------
+# Engine Class
+# -------------------------
+class Engine: # Headless rules: dealing, placement, trick resolution
+    def __init__(self, players, rng=None, log=None, rules=RULES):
+        rules.check_players(len(players))
+        if log is not None and not rules.is_classic():
+            # Logs hold neither the rules nor scores past 255; replay assumes RULES
+            raise ValueError("Game logs can only record games with the classic rules")
+        self.players = players
+        self.rng = rng if rng is not None else random.Random()
+        self.log = log  # optional gamelog.GameRecorder
+        self.rules = rules
+        self.knowledge = None  # knowledge.Knowledge, attached by the first AI that asks
+        self.deal()
+
+    @property
+    def rows(self):
+        return self.table.rows()
+
+    @classmethod
+    def restore(cls, players, rules=RULES, rng=None, table=None, starters=None, deck=None, played=None,
+                trick=None, trick_pos=0, tricks_left=0):
+        # An engine in a given mid-game state, without dealing: forks,
+        # snapshots and log replays. Every attribute __init__ and deal()
+        # set must be set here as well. Restored engines are never logged.
+        engine = cls.__new__(cls)
+        engine.players = players
+        engine.rng = rng
+        engine.log = None
+        engine.rules = rules
+        engine.knowledge = None  # rebuilt from the state if an AI asks
+        engine.table = table
+        engine.starters = starters if starters is not None else []
+        engine.deck = deck if deck is not None else []
+        engine.played = played if played is not None else []
+        engine.trick = trick if trick is not None else []
+        engine.trick_pos = trick_pos
+        engine.tricks_left = tricks_left
+        return engine
+
+    def copy(self, rng=None):
+        # Cheap fork for search. Copy-on-write: `deck`, `played` and
+        # `starters` are never mutated in place (deal and finish_trick build
+        # new lists), so forks share them and only copy the table and hands.
+        # Forks drop the tracker too, since they may get new hands. The
+        # trick is rebuilt on the copied players so placing it in the fork
+        # never charges the original game.
+        players = [player.copy() for player in self.players]
+        trick = [(card, players[self.players.index(player)]) for card, player in self.trick]
+        return Engine.restore(players, self.rules, rng if rng is not None else self.rng, self.table.copy(),
+                              self.starters, self.deck, self.played, trick, self.trick_pos, self.tricks_left)
+
+    def deal(self, deck=None):
+        # Every deal reshuffles the full deck and lays out fresh rows,
+        # so no card can be both on the table and in a hand.
+        # Sorting on random keys is a uniform shuffle and cheaper than
+        # rng.shuffle's per-card randbelow calls. Passing `deck` replays
+        # a recorded shuffle.
+        rules = self.rules
+        if deck is None:
+            rand = self.rng.random
+            deck = sorted(range(1, rules.deck_size + 1), key=lambda _: rand())
+        else:
+            deck = list(deck)
+        if self.log is not None:
+            self.log.deal(deck)
+        hand_size = rules.hand_size_for(len(self.players))
+        for i, player in enumerate(self.players):
+            player.hand = deck[i * hand_size:(i + 1) * hand_size]
+        del deck[:hand_size * len(self.players)]
+        self.table = Table([deck.pop() for _ in range(rules.rows)], rules.row_limit, rules.penalties)
+        self.starters = self.table.tails[:]
+        self.deck = deck
+        self.tricks_left = hand_size
+        self.played = []  # cards revealed so far this deal
+        self.trick = []
+        self.trick_pos = 0
+        if self.knowledge is not None:
+            self.knowledge.deal(self.table, self.players)
+
+    # -------------------------
+    # Placement
+    # -------------------------
+    def target_row(self, card):
+        # Row whose last card is the closest below `card`, or None if too low
+        return self.table.target(card)
+
+    def cheapest_row(self):
+        # AI: select row with least penalty points
+        return self.table.cheapest()
+
+    def take_row(self, player, row_index, card):
+        taken = self.table.row(row_index)
+        player.penalty_points += self.table.reset(row_index, card)
+        if self.log is not None:
+            self.log.take(player, row_index)
+        return taken
+
+    def place_card(self, player, card, row_index=None):
+        # Returns (row index, cards taken or None). `row_index` is only
+        # used when the card is lower than every row.
+        table = self.table
+        pos = bisect_left(table.order, card)
+        if pos:
+            target = table.order_rows[pos - 1]
+            if table.lengths[target] >= table.row_limit:
+                return target, self.take_row(player, target, card)
+            table.append(target, card)
+            return target, None
+        if row_index is None:
+            if player.policy is not None:
+                row_index = player.policy.choose_row(self, player, card)
+            else:
+                row_index = self.cheapest_row()
+        return row_index, self.take_row(player, row_index, card)
+
+    # -------------------------
+    # Tricks and Game Flow
+    # -------------------------
+    def choose_play(self, player):
+        # The card `player` plays this trick, removed from its hand
+        if player.policy is not None and player.hand:
+            card = player.policy.choose_card(self, player)
+            player.hand.remove(card)
+            return card
+        return player.play_card(self.rng)
+
+    def collect_plays(self):
+        plays = []
+        for player in self.players:
+            card = self.choose_play(player)
+            if card:
+                plays.append((card, player))
+        return plays
+
+    def resolve_trick(self, plays, choose_row=None):
+        # `choose_row(player, card)` picks the row to take for a too-low card;
+        # when omitted (or it returns None) the player's policy or the cheapest
+        # row decides. `trick`/`trick_pos` let a policy see the cards still to
+        # be placed.
+        plays = sorted(plays)  # card numbers are unique, players never compared
+        self.trick = plays
+        if self.knowledge is not None:
+            self.knowledge.reveal(plays)
+        for pos, (card, player) in enumerate(plays):
+            self.trick_pos = pos
+            row_index = None
+            if choose_row is not None and self.target_row(card) is None:
+                row_index = choose_row(player, card)
+            self.place_card(player, card, row_index)
+        self.finish_trick()
+        return plays
+
+    # Step-by-step resolution for front ends that cannot block on a row
+    # choice: start_trick, then place_next until next_play() is None.
+    def start_trick(self, plays):
+        self.trick = sorted(plays)
+        self.trick_pos = 0
+        if self.knowledge is not None:
+            self.knowledge.reveal(self.trick)
+
+    def next_play(self):
+        if self.trick_pos < len(self.trick):
+            return self.trick[self.trick_pos]
+        return None
+
+    def needs_row_choice(self):
+        play = self.next_play()
+        return play is not None and self.target_row(play[0]) is None
+
+    def place_next(self, row_index=None):
+        card, player = self.trick[self.trick_pos]
+        result = self.place_card(player, card, row_index)
+        self.trick_pos += 1
+        if self.trick_pos == len(self.trick):
+            self.finish_trick()
+        return result
+
+    def finish_trick(self):
+        self.played = self.played + [card for card, _ in self.trick]  # new list: forks share the old one
+        self.tricks_left -= 1
+        if self.log is not None:
+            self.log.trick(self.trick)
+
+    def hands_empty(self):
+        return self.tricks_left <= 0
+
+    def is_over(self):
+        max_penalty = self.rules.max_penalty
+        return any(player.penalty_points >= max_penalty for player in self.players)
+
+    def step(self):
+        # One iteration of the game loop: re-deal or play a trick
+        if self.hands_empty():
+            self.deal()
+        else:
+            self.resolve_trick(self.collect_plays())
+
+    def play_to_end(self):
+        while not self.is_over():
+            self.step()
+        return self
+
+def game_rng(rng=None):
+    # A fresh RNG for one game and the seed that recreates it. Seeds are
+    # drawn from the run's RNG, so a seeded run still repeats exactly and
+    # each logged game records the seed it was played from.
+    seed = (rng if rng is not None else random).getrandbits(63)
+    return random.Random(seed), seed
+
+def play_game(player_count, rng=None, log=None, rules=RULES):
+    # `log` is an open gamelog.GameLogWriter, or None
+    players = [Player(f"AI{i}") for i in range(1, player_count + 1)]
+    rng, seed = game_rng(rng)
+    if log is None:
+        return Engine(players, rng, rules=rules).play_to_end()
+    from gamelog import GameRecorder
+    recorder = GameRecorder(players, seed)
+    game = Engine(players, rng, recorder, rules).play_to_end()
+    log.record(recorder)
+    return game
+
+# -------------------------
+# Simulate from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Run headless 6nimmt! games.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--log", default=None, help="append every game to this game log")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    totals = [0] * args.players
+    log = None
+    if args.log:
+        from gamelog import GameLogWriter
+        log = GameLogWriter(args.log)
+    start = time.perf_counter()
+    for _ in range(args.games):
+        game = play_game(args.players, rng, log)
+        for i, player in enumerate(game.players):
+            totals[i] += player.penalty_points
+    elapsed = time.perf_counter() - start
+    if log is not None:
+        log.close()
+
+    for i, total in enumerate(totals):
+        print(f"AI{i + 1}: mean penalty {total / args.games:.2f}")
+    print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed * 60:,.0f} games/min)")
@@ -0,0 +1,267 @@
+import mmap
+import os
+import struct
+
+from engine import RULES, Engine, Player
+
+# -------------------------
+# File Format
+# -------------------------
+# An append-only file: MAGIC, then one block per finished game.
+#
+#   game header   GAME_HEADER: block size (bytes after the header), players,
+#                 deals, deck size, tricks, seed of the game's own RNG
+#                 (engine.game_rng; NO_SEED if unknown)
+#   per deal      1 byte trick count, then the shuffled deck (1 byte per card)
+#                 exactly as Engine.deal consumed it
+#     per trick   players bytes: card played by each seat (0 = none)
+#                 players bytes: row taken by each seat (NO_TAKE = none)
+#   trailer       players bytes: final penalty of each seat
+#
+# Every field is fixed width, so a block is located by its header alone and
+# a truncated block at the end of the file (e.g. after a crash) is ignored
+# by readers and cut off before a writer appends anything after it.
+
+MAGIC = b"6NIMMT\x00\x01"
+GAME_HEADER = struct.Struct("<IBBBHQ")
+NO_SEED = 2 ** 64 - 1
+NO_TAKE = 0xFF
+
+# -------------------------
+# Recording
+# -------------------------
+class GameRecorder: # Engine.log hook; encodes one game in memory
+    def __init__(self, players, seed=None):
+        self.seats = {player: i for i, player in enumerate(players)}
+        self.players = players
+        self.seed = NO_SEED if seed is None else seed
+        self.body = bytearray()
+        self.deals = 0
+        self.tricks = 0
+        self.deck_size = 0
+        self.deal_pos = 0
+        self.takes = bytearray([NO_TAKE] * len(players))
+
+    def deal(self, deck):
+        self.deal_pos = len(self.body)
+        self.deck_size = len(deck)
+        self.body.append(0)
+        self.body += bytes(deck)
+        self.deals += 1
+
+    def take(self, player, row_index):
+        self.takes[self.seats[player]] = row_index
+
+    def trick(self, plays):
+        cards = bytearray(len(self.players))
+        for card, player in plays:
+            cards[self.seats[player]] = card
+        self.body += cards
+        self.body += self.takes
+        self.takes = bytearray([NO_TAKE] * len(self.players))
+        self.body[self.deal_pos] += 1
+        self.tricks += 1
+
+    def finish(self):
+        # The complete block; call once the game is over
+        trailer = bytes(player.penalty_points for player in self.players)
+        header = GAME_HEADER.pack(len(self.body) + len(trailer), len(self.players), self.deals,
+                                  self.deck_size, self.tricks, self.seed)
+        return header + self.body + trailer
+
+class GameLogWriter: # Appends finished games to a log file
+    def __init__(self, path):
+        self.file = open(path, "ab")
+        try:
+            self.repair(path)
+        except ValueError:
+            self.file.close()
+            raise
+        self.games = 0
+
+    def repair(self, path):
+        # Cut a partial block (or partial MAGIC) left by a crash, so the
+        # games appended next are not read as part of it
+        size = self.file.tell()
+        if size < len(MAGIC):
+            with open(path, "rb") as existing:
+                if not MAGIC.startswith(existing.read()):
+                    raise ValueError(f"{path} is not a game log")
+            self.file.truncate(0)
+            self.file.write(MAGIC)
+            return
+        with GameLog(path) as log:
+            end = log.end()
+        if end < size:
+            self.file.truncate(end)
+
+    def write(self, block, games=1):
+        # `block` may hold several finished games back to back
+        self.file.write(block)
+        self.games += games
+
+    def record(self, recorder):
+        self.write(recorder.finish())
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# -------------------------
+# Reading
+# -------------------------
+class GameRecord: # Lazy view of one game block inside the mapped file
+    __slots__ = ("buffer", "offset", "size", "players", "deals", "deck_size", "tricks", "seed")
+
+    def __init__(self, buffer, offset):
+        self.buffer = buffer
+        self.offset = offset
+        self.size, self.players, self.deals, self.deck_size, self.tricks, self.seed = \
+            GAME_HEADER.unpack_from(buffer, offset)
+
+    @property
+    def penalties(self):
+        end = self.offset + GAME_HEADER.size + self.size
+        return list(self.buffer[end - self.players:end])
+
+    def iter_deals(self):
+        # Yields (deck, [(cards by seat, rows taken by seat), ...]) per deal
+        pos = self.offset + GAME_HEADER.size
+        players = self.players
+        buffer = self.buffer
+        for _ in range(self.deals):
+            tricks = buffer[pos]
+            deck = buffer[pos + 1:pos + 1 + self.deck_size]
+            pos += 1 + self.deck_size
+            plays = []
+            for _ in range(tricks):
+                plays.append((buffer[pos:pos + players], buffer[pos + players:pos + 2 * players]))
+                pos += 2 * players
+            yield deck, plays
+
+class GameLog: # Memory-mapped reader; iterates or indexes games without loading the file
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        if os.fstat(self.file.fileno()).st_size < len(MAGIC):
+            self.file.close()
+            raise ValueError(f"{path} is not a game log")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.buffer[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a game log")
+        self.offsets = None
+
+    def scan(self):
+        # Offsets of every complete block, walking headers only
+        buffer = self.buffer
+        end = len(buffer)
+        pos = len(MAGIC)
+        header_size = GAME_HEADER.size
+        unpack_size = struct.Struct("<I").unpack_from
+        while pos + header_size <= end:
+            block_end = pos + header_size + unpack_size(buffer, pos)[0]
+            if block_end > end:
+                break
+            yield pos
+            pos = block_end
+
+    def end(self):
+        # Offset just past the last complete block
+        offsets = self.index()
+        if not offsets:
+            return len(MAGIC)
+        return offsets[-1] + GAME_HEADER.size + struct.unpack_from("<I", self.buffer, offsets[-1])[0]
+
+    def index(self):
+        if self.offsets is None:
+            self.offsets = list(self.scan())
+        return self.offsets
+
+    def __len__(self):
+        return len(self.index())
+
+    def __getitem__(self, i):
+        return GameRecord(self.buffer, self.index()[i])
+
+    def __iter__(self):
+        for offset in self.scan():
+            yield GameRecord(self.buffer, offset)
+
+    def close(self):
+        if hasattr(self, "buffer"):
+            self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# -------------------------
+# Replay
+# -------------------------
+def replay_engine(players):
+    # An engine that is only ever dealt recorded decks (classic rules); its
+    # RNG is never used, every random choice comes from the log
+    return Engine.restore(players, RULES)
+
+def replay(record, players=None):
+    # Re-run a recorded game through the rules engine: same decks, same
+    # plays, same row choices. Returns the finished engine.
+    players = players or [Player(f"P{i + 1}") for i in range(record.players)]
+    engine = replay_engine(players)
+    for deck, tricks in record.iter_deals():
+        engine.deal(deck)
+        for cards, takes in tricks:
+            plays = [(card, players[seat]) for seat, card in enumerate(cards) if card]
+            for card, player in plays:
+                player.hand.remove(card)
+            engine.resolve_trick(plays, lambda player, card: takes[players.index(player)])
+    return engine
+
+def verify(record):
+    return [player.penalty_points for player in replay(record).players] == record.penalties
+
+# -------------------------
+# Inspect a log from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Summarize and replay a 6nimmt! game log.")
+    parser.add_argument("path")
+    parser.add_argument("--verify", type=int, default=0, help="replay this many games and check the penalties")
+    args = parser.parse_args()
+
+    with GameLog(args.path) as log:
+        start = time.perf_counter()
+        games = tricks = 0
+        totals = {}
+        counts = {}
+        for record in log:
+            games += 1
+            tricks += record.tricks
+            counts[record.players] = counts.get(record.players, 0) + 1
+            for seat, penalty in enumerate(record.penalties):
+                totals.setdefault(record.players, [0] * record.players)[seat] += penalty
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(args.path)
+        print(f"{games:,} games, {tricks:,} tricks, {size / max(games, 1):.0f} bytes/game, "
+              f"scanned in {elapsed:.2f}s ({games / max(elapsed, 1e-9):,.0f} games/sec)")
+        for player_count, seat_totals in sorted(totals.items()):
+            print(f"{player_count} players ({counts[player_count]:,} games): mean penalty by seat "
+                  + " ".join(f"{total / counts[player_count]:.2f}" for total in seat_totals))
+
+        if args.verify:
+            start = time.perf_counter()
+            step = max(len(log) // args.verify, 1)
+            checked = [verify(log[i]) for i in range(0, len(log), step)][:args.verify]
+            print(f"replayed {len(checked)} games in {time.perf_counter() - start:.2f}s: "
+                  f"{sum(checked)} match, {len(checked) - sum(checked)} differ")
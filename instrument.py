@@ -0,0 +1,160 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+# -------------------------
+# Phase Timers
+# -------------------------
+# Methods are registered with watch() and only wrapped with timers while
+# instrumentation is enabled, so a disabled session runs the original code
+# with no extra calls at all.
+#
+# Times are exclusive: a watched call nested inside another (placement
+# inside the round update) is charged to its own phase only. An inclusive
+# phase keeps everything it calls, so an AI searching over forked engines
+# shows up as AI time, not placement.
+
+class Instruments: # Per-phase timers and call counters, averaged over recent frames
+    def __init__(self, window=120):
+        self.enabled = False
+        self.watched = []  # (owner, attribute, phase, inclusive, original)
+        self.stack = []  # child time accumulated by each active timer
+        self.claimed = 0  # > 0 while an inclusive timer is running
+        self.frame_phases = {}  # phase -> [seconds, calls] this frame
+        self.frames = deque(maxlen=window)  # (frame seconds, phases) per frame
+        self.totals = {}  # phase -> [seconds, calls] since enabled
+
+    def watch(self, owner, attribute, phase, inclusive=False):
+        original = owner.__dict__[attribute]
+        self.watched.append((owner, attribute, phase, inclusive, original))
+        if self.enabled:
+            setattr(owner, attribute, self.timed(original, phase, inclusive))
+
+    def timed(self, fn, phase, inclusive=False):
+        stack = self.stack
+        perf_counter = time.perf_counter
+        add = self.add
+
+        def timed_call(*args, **kwargs):
+            if self.claimed:
+                return fn(*args, **kwargs)
+            stack.append(0.0)
+            self.claimed += inclusive
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                self.claimed -= inclusive
+                child = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                add(phase, elapsed - child)
+        timed_call.__wrapped__ = fn
+        return timed_call
+
+    def enable(self):
+        if not self.enabled:
+            self.enabled = True
+            for owner, attribute, phase, inclusive, original in self.watched:
+                setattr(owner, attribute, self.timed(original, phase, inclusive))
+
+    def disable(self):
+        if self.enabled:
+            self.enabled = False
+            for owner, attribute, phase, inclusive, original in self.watched:
+                setattr(owner, attribute, original)
+            self.stack.clear()
+            self.claimed = 0
+            self.frame_phases = {}
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def add(self, phase, seconds, calls=1):
+        entry = self.frame_phases.get(phase)
+        if entry is None:
+            entry = self.frame_phases[phase] = [0.0, 0]
+        entry[0] += seconds
+        entry[1] += calls
+
+    def end_frame(self, seconds):
+        # Close the current frame; `seconds` is its busy time (idle waits excluded)
+        if not self.enabled:
+            return
+        self.frames.append((seconds, self.frame_phases))
+        for phase, (phase_seconds, calls) in self.frame_phases.items():
+            total = self.totals.setdefault(phase, [0.0, 0])
+            total[0] += phase_seconds
+            total[1] += calls
+        self.frame_phases = {}
+
+    def phase_ms(self):
+        # Mean ms and calls per frame for each phase over the window
+        if not self.frames:
+            return {}
+        sums = {}
+        for _, phases in self.frames:
+            for phase, (seconds, calls) in phases.items():
+                entry = sums.setdefault(phase, [0.0, 0])
+                entry[0] += seconds
+                entry[1] += calls
+        count = len(self.frames)
+        return {phase: (seconds * 1000 / count, calls / count) for phase, (seconds, calls) in sums.items()}
+
+    def histogram(self, bins=10, bin_ms=4.0):
+        # Frame counts per `bin_ms` bucket; the last bucket holds everything slower
+        counts = [0] * bins
+        for seconds, _ in self.frames:
+            counts[min(int(seconds * 1000 / bin_ms), bins - 1)] += 1
+        return counts
+
+    def report(self):
+        lines = [f"{'phase':<12} {'total ms':>10} {'calls':>10} {'ms/call':>10}"]
+        for phase, (seconds, calls) in sorted(self.totals.items(), key=lambda item: -item[1][0]):
+            lines.append(f"{phase:<12} {seconds * 1000:>10.1f} {calls:>10} {seconds * 1000 / max(calls, 1):>10.4f}")
+        return "\n".join(lines)
+
+# -------------------------
+# Sampling Profiler
+# -------------------------
+class SamplingProfiler: # Samples one thread's stack from a helper thread
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.samples = Counter()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+
+    def sample(self):
+        while self.running:
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def dump(self, path):
+        # Collapsed stacks ("a;b;c count"), the input format of flame graph tools
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
@@ -0,0 +1,182 @@
+from engine import DECK_SIZE
+
+def deck_mask(deck_size):
+    return ((1 << (deck_size + 1)) - 1) & ~1  # bit n set for every card n
+
+
+# -------------------------
+# Card Knowledge
+# -------------------------
+# Cards are bits of a Python int, so "which cards are still live" is one
+# AND-NOT and "how many between X and Y" one AND plus a popcount, instead
+# of rescanning the hand, the rows and every revealed trick.
+#
+# One tracker is shared by every AI at a table. It keeps the public
+# cards (row starters and every revealed play) and each seat's hand, and
+# is updated by the engine as cards are dealt and revealed. Row takes
+# change nothing: a taken row's cards were all public already.
+
+def bits(cards):
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    return mask
+
+def cards_of(mask):
+    # Card numbers in ascending order; scanning the binary string is
+    # faster in Python than peeling off one low bit at a time
+    return [card for card, bit in enumerate(bin(mask)[:1:-1]) if bit == "1"]
+
+def between(low, high):
+    # Cards strictly between `low` and `high`
+    return ((1 << high) - 1) & ~((1 << (low + 1)) - 1) if high > low + 1 else 0
+
+class Knowledge: # Public cards and per-seat hands of one table, as bitsets
+    __slots__ = ("deck_size", "deck", "seats", "seen", "hands")
+
+    def __init__(self, players, deck_size=DECK_SIZE):
+        self.deck_size = deck_size
+        self.deck = deck_mask(deck_size)
+        self.seats = {player: seat for seat, player in enumerate(players)}
+        self.seen = 0
+        self.hands = [0] * len(players)
+
+    @classmethod
+    def attach(cls, engine):
+        # The engine's tracker, built from the current state on first use
+        if engine.knowledge is None:
+            knowledge = cls(engine.players, engine.rules.deck_size)
+            knowledge.sync(engine)
+            engine.knowledge = knowledge
+        return engine.knowledge
+
+    def sync(self, engine):
+        # Starters count even after their row was taken
+        self.seen = bits(engine.starters) | bits(engine.played) | bits(card for card, _ in engine.trick)
+        self.hands = [bits(player.hand) for player in engine.players]
+
+    def deal(self, table, players):
+        self.seen = bits(table.tails)
+        self.hands = [bits(player.hand) for player in players]
+
+    def reveal(self, plays):
+        seats = self.seats
+        for card, player in plays:
+            bit = 1 << card
+            self.seen |= bit
+            self.hands[seats[player]] &= ~bit
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def live(self, player):
+        # Cards `player` has not seen: in other hands or never dealt
+        return self.deck & ~self.seen & ~self.hands[self.seats[player]]
+
+    def unseen(self, player):
+        return cards_of(self.live(player))
+
+    def live_count(self, player):
+        return self.live(player).bit_count()
+
+    def live_between(self, player, low, high):
+        # How many live cards lie strictly between `low` and `high`
+        return (self.live(player) & between(low, high)).bit_count()
+
+    def take_chance(self, player, table, row):
+        # Chance that one of the other players' cards this trick is the
+        # 6th on `row`, if each plays a uniformly random live card
+        live = self.live(player)
+        total = live.bit_count()
+        opponents = sum(1 for other in self.seats if other is not player and self.hands[self.seats[other]])
+        needed = table.row_limit - table.lengths[row] + 1
+        if not total or needed > opponents:
+            return 0.0
+        tail = table.tails[row]
+        higher = [t for t in table.tails if t > tail]
+        p = (live & between(tail, min(higher) if higher else self.deck_size + 1)).bit_count() / total
+        if p == 1.0:
+            return 1.0
+        # Binomial tail: at least `needed` of `opponents` land on the row
+        chance = 0.0
+        term = (1 - p) ** opponents  # P(exactly 0)
+        for k in range(opponents + 1):
+            if k >= needed:
+                chance += term
+            term *= (opponents - k) / (k + 1) * p / (1 - p)
+        return min(chance, 1.0)
+
+# -------------------------
+# Check the queries from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+    import math
+    import random
+    import time
+
+    from engine import Engine, Player
+
+    parser = argparse.ArgumentParser(description="Check the card tracker against brute-force counting.")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    def expected_chance(unseen, engine, player, row):
+        # take_chance's model, counted over a plain list of unseen cards
+        table = engine.table
+        opponents = sum(1 for other in engine.players if other is not player and other.hand)
+        needed = table.row_limit - table.lengths[row] + 1
+        if not unseen or needed > opponents:
+            return 0.0
+        tail = table.tails[row]
+        upper = min([t for t in table.tails if t > tail], default=engine.rules.deck_size + 1)
+        p = sum(tail < card < upper for card in unseen) / len(unseen)
+        return sum(math.comb(opponents, k) * p ** k * (1 - p) ** (opponents - k)
+                   for k in range(needed, opponents + 1))
+
+    def check(engine, rng):
+        # Every query for every seat; returns the number of wrong answers
+        knowledge = engine.knowledge
+        seen = set(engine.starters) | set(engine.played) | {card for card, _ in engine.trick}
+        wrong = 0
+        for player in engine.players:
+            unseen = sorted(set(range(1, engine.rules.deck_size + 1)) - seen - set(player.hand))
+            low, high = sorted(rng.sample(range(engine.rules.deck_size + 2), 2))
+            wrong += knowledge.unseen(player) != unseen
+            wrong += knowledge.live_count(player) != len(unseen)
+            wrong += knowledge.live_between(player, low, high) != sum(low < card < high for card in unseen)
+            for row in range(len(engine.table.tails)):
+                expected = expected_chance(unseen, engine, player, row)
+                wrong += not math.isclose(knowledge.take_chance(player, engine.table, row), expected,
+                                          rel_tol=1e-9, abs_tol=1e-12)
+        return wrong
+
+    rng = random.Random(args.seed)
+    positions = wrong = 0
+    for _ in range(args.games):
+        engine = Engine([Player(f"AI{i + 1}") for i in range(args.players)], rng)
+        Knowledge.attach(engine)
+        while not engine.is_over():
+            if engine.hands_empty():
+                engine.deal()
+            else:
+                # Checked before every placement, mid-trick included
+                engine.start_trick(engine.collect_plays())
+                while engine.next_play() is not None:
+                    wrong += check(engine, rng)
+                    positions += 1
+                    engine.place_next()
+    print(f"{positions:,} positions checked, {wrong} wrong answers")
+
+    knowledge = engine.knowledge
+    player = engine.players[0]
+    for name, query in (("live_count", lambda: knowledge.live_count(player)),
+                        ("live_between", lambda: knowledge.live_between(player, 20, 60)),
+                        ("take_chance", lambda: knowledge.take_chance(player, engine.table, 0))):
+        runs = 100000
+        start = time.perf_counter()
+        for _ in range(runs):
+            query()
+        print(f"{name}: {(time.perf_counter() - start) / runs * 1e6:.2f} us")
@@ -0,0 +1,401 @@
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from engine import HAND_SIZE, MAX_CARD, PENALTIES, Engine, Player
+from knowledge import Knowledge
+from tournament import MAX_PLAYERS, MIN_PLAYERS, chunk_seed
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "learned_model.npz")
+PENALTY_TABLE = np.array(PENALTIES, dtype=np.float32)
+HORIZON = 2  # tricks of penalty a decision is credited with
+
+# -------------------------
+# Features
+# -------------------------
+# A decision is scored by the penalty its player takes over the next
+# HORIZON tricks of the deal. Each candidate (a card, or a row to take)
+# becomes one feature row, so one predict() call ranks many decisions.
+
+CARD_FEATURES = 12
+ROW_FEATURES = 6
+
+def unseen_counts(engine, player):
+    # Cumulative count of the cards `player` has not seen: cs[k] = live cards <= k
+    live = Knowledge.attach(engine).live(player).to_bytes((MAX_CARD + 8) // 8, "little")
+    return np.cumsum(np.unpackbits(np.frombuffer(live, dtype=np.uint8), bitorder="little"), dtype=np.int32)
+
+def card_features(engine, player, unseen_cs, hand=None):
+    # One row per card in `hand` (default: the player's sorted hand)
+    table = engine.table
+    hand = np.array(sorted(player.hand) if hand is None else hand, dtype=np.int32)
+    order = np.array(table.order, dtype=np.int32)
+    order_rows = np.array(table.order_rows, dtype=np.int32)
+    penalties = np.array(table.penalties, dtype=np.float32)
+    lengths = np.array(table.lengths, dtype=np.float32)
+
+    pos = np.searchsorted(order, hand)
+    too_low = pos == 0
+    below = np.maximum(pos - 1, 0)
+    target = order_rows[below]
+    tail = np.where(too_low, 0, order[below])
+    length = np.where(too_low, 0.0, lengths[target])
+    cheapest = penalties.min()
+    # Unseen cards between the target tail and our card could land first
+    threats = unseen_cs[hand - 1] - unseen_cs[tail]
+    opponents = max(len(engine.players) - 1, 1)
+    deck_size = engine.rules.deck_size
+
+    features = np.empty((len(hand), CARD_FEATURES), dtype=np.float32)
+    features[:, 0] = hand / deck_size
+    features[:, 1] = PENALTY_TABLE[hand] / 7
+    features[:, 2] = too_low
+    features[:, 3] = (hand - tail) * ~too_low / deck_size
+    features[:, 4] = length / table.row_limit
+    features[:, 5] = np.where(too_low, cheapest, penalties[target]) / 20
+    features[:, 6] = length >= table.row_limit
+    features[:, 7] = np.maximum(threats, 0) / opponents
+    features[:, 8] = cheapest / 20
+    features[:, 9] = np.arange(len(hand)) / max(len(hand), 1)
+    features[:, 10] = opponents / (MAX_PLAYERS - 1)
+    features[:, 11] = engine.tricks_left / HAND_SIZE
+    return hand, features
+
+def row_features(engine, card):
+    # One row per table row, for taking it with a too-low `card`
+    table = engine.table
+    deck_size = engine.rules.deck_size
+    penalties = np.array(table.penalties, dtype=np.float32)
+    features = np.empty((len(penalties), ROW_FEATURES), dtype=np.float32)
+    features[:, 0] = penalties / 20
+    features[:, 1] = np.array(table.lengths, dtype=np.float32) / table.row_limit
+    features[:, 2] = penalties == penalties.min()
+    features[:, 3] = np.array(table.tails, dtype=np.float32) / deck_size
+    features[:, 4] = card / deck_size
+    features[:, 5] = (len(engine.trick) - engine.trick_pos - 1) / (MAX_PLAYERS - 1)
+    return features
+
+# -------------------------
+# Model
+# -------------------------
+class ValueNet: # Tiny MLP (inputs -> hidden ReLU -> 1) trained with Adam on MSE
+    def __init__(self, inputs, hidden=32, rng=None):
+        rng = rng if rng is not None else np.random.default_rng(0)
+        self.params = {
+            "w1": (rng.standard_normal((inputs, hidden)) * np.sqrt(2 / inputs)).astype(np.float32),
+            "b1": np.zeros(hidden, dtype=np.float32),
+            "w2": (rng.standard_normal((hidden, 1)) * np.sqrt(1 / hidden)).astype(np.float32),
+            "b2": np.zeros(1, dtype=np.float32),
+        }
+        self.moments = {name: (np.zeros_like(p), np.zeros_like(p)) for name, p in self.params.items()}
+        self.steps = 0
+
+    def predict(self, x):
+        p = self.params
+        return (np.maximum(x @ p["w1"] + p["b1"], 0) @ p["w2"] + p["b2"])[:, 0]
+
+    def update(self, x, y, lr=1e-3, beta1=0.9, beta2=0.999):
+        p = self.params
+        hidden = np.maximum(x @ p["w1"] + p["b1"], 0)
+        error = (hidden @ p["w2"] + p["b2"])[:, 0] - y
+        d_out = (2 / len(y)) * error[:, None]
+        d_hidden = (d_out @ p["w2"].T) * (hidden > 0)
+        grads = {"w2": hidden.T @ d_out, "b2": d_out.sum(0), "w1": x.T @ d_hidden, "b1": d_hidden.sum(0)}
+        self.steps += 1
+        for name, grad in grads.items():
+            m, v = self.moments[name]
+            m *= beta1
+            m += (1 - beta1) * grad
+            v *= beta2
+            v += (1 - beta2) * grad * grad
+            m_hat = m / (1 - beta1 ** self.steps)
+            v_hat = v / (1 - beta2 ** self.steps)
+            p[name] -= lr * m_hat / (np.sqrt(v_hat) + 1e-8)
+        return float((error * error).mean())
+
+    def get_weights(self):
+        return {name: p.copy() for name, p in self.params.items()}
+
+    def set_weights(self, weights):
+        self.params = {name: np.asarray(p, dtype=np.float32).copy() for name, p in weights.items()}
+
+class CardModel: # Card and row value nets; lower predicted penalty is better
+    def __init__(self, hidden=32, seed=0):
+        rng = np.random.default_rng(seed)
+        self.card_net = ValueNet(CARD_FEATURES, hidden, rng)
+        self.row_net = ValueNet(ROW_FEATURES, hidden, rng)
+
+    def get_weights(self):
+        return {"card": self.card_net.get_weights(), "row": self.row_net.get_weights()}
+
+    def set_weights(self, weights):
+        self.card_net.set_weights(weights["card"])
+        self.row_net.set_weights(weights["row"])
+
+    @classmethod
+    def from_weights(cls, weights):
+        model = cls.__new__(cls)
+        model.card_net = ValueNet.__new__(ValueNet)
+        model.row_net = ValueNet.__new__(ValueNet)
+        model.set_weights(weights)
+        return model
+
+    def save(self, path=MODEL_PATH):
+        arrays = {f"{net}.{name}": p for net, params in self.get_weights().items() for name, p in params.items()}
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        weights = {"card": {}, "row": {}}
+        with np.load(path) as data:
+            for key in data.files:
+                net, name = key.split(".")
+                weights[net][name] = data[key]
+        return cls.from_weights(weights)
+
+    def choose_card(self, engine, player):
+        hand, features = card_features(engine, player, unseen_counts(engine, player))
+        return int(hand[np.argmin(self.card_net.predict(features))])
+
+    def choose_row(self, engine, card):
+        return int(np.argmin(self.row_net.predict(row_features(engine, card))))
+
+# -------------------------
+# Experience
+# -------------------------
+class ReplayBuffer: # Ring buffer of (features, target) rows fed by every worker
+    def __init__(self, capacity, width, rng=None):
+        self.x = np.zeros((capacity, width), dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self.size = 0
+        self.pos = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def add(self, x, y):
+        for start in range(0, len(y), self.capacity):
+            xs, ys = x[start:start + self.capacity], y[start:start + self.capacity]
+            end = self.pos + len(ys)
+            if end <= self.capacity:
+                self.x[self.pos:end], self.y[self.pos:end] = xs, ys
+            else:
+                split = self.capacity - self.pos
+                self.x[self.pos:], self.y[self.pos:] = xs[:split], ys[:split]
+                self.x[:end - self.capacity], self.y[:end - self.capacity] = xs[split:], ys[split:]
+            self.pos = end % self.capacity
+            self.size = min(self.size + len(ys), self.capacity)
+
+    def sample(self, batch_size):
+        idx = self.rng.integers(0, self.size, batch_size)
+        return self.x[idx], self.y[idx]
+
+class Pending: # Decisions waiting for their HORIZON tricks to resolve
+    def __init__(self):
+        self.card_x, self.card_y, self.row_x, self.row_y = [], [], [], []
+        self.open = {}  # engine -> [(is_row, features, player, penalty before, tricks left)]
+
+    def add(self, engine, is_row, features, player):
+        self.open.setdefault(engine, []).append((is_row, features, player, player.penalty_points, engine.tricks_left))
+
+    def settle(self, engine):
+        # Called after each trick; the end of a deal closes every open decision
+        deal_over = engine.hands_empty() or engine.is_over()
+        still_open = []
+        for entry in self.open.pop(engine, ()):
+            is_row, features, player, before, tricks_left = entry
+            if deal_over or tricks_left - engine.tricks_left >= HORIZON:
+                xs, ys = (self.row_x, self.row_y) if is_row else (self.card_x, self.card_y)
+                xs.append(features)
+                ys.append(player.penalty_points - before)
+            else:
+                still_open.append(entry)
+        if still_open:
+            self.open[engine] = still_open
+
+    def arrays(self):
+        def stack(xs, ys, width):
+            if not xs:
+                return np.zeros((0, width), dtype=np.float32), np.zeros(0, dtype=np.float32)
+            return np.array(xs, dtype=np.float32), np.array(ys, dtype=np.float32)
+        return stack(self.card_x, self.card_y, CARD_FEATURES) + stack(self.row_x, self.row_y, ROW_FEATURES)
+
+# -------------------------
+# Self-Play
+# -------------------------
+class LockstepGames: # Many games advanced trick by trick, one predict() per trick
+    def __init__(self, model, count, player_count, rng, epsilon=0.0, learned_seats=None, pending=None):
+        self.model = model
+        self.player_count = player_count
+        self.rng = rng
+        self.epsilon = epsilon
+        # Seats played by the model; the others play randomly
+        self.learned_seats = set(range(player_count) if learned_seats is None else learned_seats)
+        self.pending = pending
+        self.engines = [self.new_game() for _ in range(count)]
+        self.finished = []
+        self.decisions = 0
+
+    def new_game(self):
+        return Engine([Player(f"P{i + 1}") for i in range(self.player_count)], self.rng)
+
+    def step(self):
+        # Batched card choice for every learned seat of every game
+        segments, blocks = [], []
+        for engine in self.engines:
+            for seat, player in enumerate(engine.players):
+                if seat in self.learned_seats and player.hand:
+                    hand, features = card_features(engine, player, unseen_counts(engine, player))
+                    segments.append((engine, player, hand, features))
+                    blocks.append(features)
+        scores = self.model.card_net.predict(np.concatenate(blocks)) if blocks else []
+        self.decisions += len(segments)
+
+        chosen = {}
+        start = 0
+        for engine, player, hand, features in segments:
+            end = start + len(hand)
+            if self.epsilon and self.rng.random() < self.epsilon:
+                k = int(self.rng.random() * len(hand))
+            else:
+                k = int(np.argmin(scores[start:end]))
+            start = end
+            chosen[player] = int(hand[k])
+            if self.pending is not None:
+                self.pending.add(engine, False, features[k], player)
+
+        for i, engine in enumerate(self.engines):
+            plays = []
+            for player in engine.players:
+                card = chosen.get(player)
+                if card is not None:
+                    player.hand.remove(card)
+                else:
+                    card = player.play_card(self.rng)
+                if card:
+                    plays.append((card, player))
+            engine.resolve_trick(plays, lambda player, card, engine=engine: self.choose_row(engine, player, card))
+            if self.pending is not None:
+                self.pending.settle(engine)
+            if engine.is_over():
+                self.finished.append([player.penalty_points for player in engine.players])
+                self.engines[i] = self.new_game()
+            elif engine.hands_empty():
+                engine.deal()
+
+    def choose_row(self, engine, player, card):
+        seat = engine.players.index(player)
+        if seat not in self.learned_seats:
+            return engine.cheapest_row()
+        features = row_features(engine, card)
+        self.decisions += 1
+        if self.epsilon and self.rng.random() < self.epsilon:
+            row = int(self.rng.random() * len(features))
+        else:
+            row = int(np.argmin(self.model.row_net.predict(features)))
+        if self.pending is not None:
+            self.pending.add(engine, True, features[row], player)
+        return row
+
+    def run(self, games):
+        while len(self.finished) < games:
+            self.step()
+        return self.finished[:games]
+
+def self_play(weights, games, player_count, seed, epsilon, lockstep=32):
+    # Worker task: returns (card_x, card_y, row_x, row_y, games, decisions)
+    rng = random.Random(seed)
+    pending = Pending()
+    play = LockstepGames(CardModel.from_weights(weights), min(lockstep, games), player_count, rng, epsilon,
+                         pending=pending)
+    play.run(games)
+    return pending.arrays() + (len(play.finished), play.decisions)
+
+# -------------------------
+# Training
+# -------------------------
+def train(tasks=60, games_per_task=64, player_count=4, workers=None, seed=0, epsilon=(0.3, 0.05),
+          updates_per_task=200, batch_size=256, on_progress=None):
+    if not MIN_PLAYERS <= player_count <= MAX_PLAYERS:
+        raise ValueError(f"Need {MIN_PLAYERS}-{MAX_PLAYERS} players, got {player_count}")
+    model = CardModel(seed=seed)
+    buffer_rng = np.random.default_rng(seed)
+    cards = ReplayBuffer(200000, CARD_FEATURES, buffer_rng)
+    rows = ReplayBuffer(50000, ROW_FEATURES, buffer_rng)
+    workers = workers or os.cpu_count()
+    stats = {"games": 0, "decisions": 0, "updates": 0, "card_loss": 0.0, "row_loss": 0.0}
+    start = time.perf_counter()
+
+    def epsilon_for(task):
+        # Linear decay from epsilon[0] to epsilon[1] over the run
+        return epsilon[0] + (epsilon[1] - epsilon[0]) * task / max(tasks - 1, 1)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        submitted = 0
+        running = set()
+        while submitted < min(workers, tasks):
+            running.add(pool.submit(self_play, model.get_weights(), games_per_task, player_count,
+                                    chunk_seed(seed, submitted), epsilon_for(submitted)))
+            submitted += 1
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                card_x, card_y, row_x, row_y, games, decisions = future.result()
+                cards.add(card_x, card_y)
+                rows.add(row_x, row_y)
+                stats["games"] += games
+                stats["decisions"] += decisions
+                for _ in range(updates_per_task):
+                    stats["card_loss"] = model.card_net.update(*cards.sample(batch_size))
+                    if rows.size:
+                        stats["row_loss"] = model.row_net.update(*rows.sample(batch_size))
+                stats["updates"] += updates_per_task
+                if submitted < tasks:
+                    # Workers always start from the latest weights
+                    running.add(pool.submit(self_play, model.get_weights(), games_per_task, player_count,
+                                            chunk_seed(seed, submitted), epsilon_for(submitted)))
+                    submitted += 1
+                if on_progress is not None:
+                    on_progress(stats, time.perf_counter() - start)
+    stats["elapsed"] = time.perf_counter() - start
+    return model, stats
+
+def evaluate(model, games, player_count=4, seed=1, lockstep=64):
+    # Seat 0 plays the model against random seats; returns (mean penalties, decisions/sec)
+    play = LockstepGames(model, lockstep, player_count, random.Random(seed), learned_seats=[0])
+    start = time.perf_counter()
+    scores = np.array(play.run(games))
+    return scores.mean(axis=0), play.decisions / (time.perf_counter() - start)
+
+# -------------------------
+# Train from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the learned 6nimmt! policy by parallel self-play.")
+    parser.add_argument("--tasks", type=int, default=60, help="self-play tasks handed to workers")
+    parser.add_argument("--games-per-task", type=int, default=64)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--eval-games", type=int, default=2000)
+    parser.add_argument("--out", default=MODEL_PATH)
+    args = parser.parse_args()
+
+    def progress(stats, elapsed):
+        print(f"\r{stats['games']} games, {stats['games'] / elapsed:,.0f} games/sec, "
+              f"{stats['decisions'] / elapsed:,.0f} decisions/sec, "
+              f"loss card {stats['card_loss']:.2f} row {stats['row_loss']:.2f}   ", end="", flush=True)
+
+    model, stats = train(args.tasks, args.games_per_task, args.players, args.workers, args.seed,
+                         on_progress=progress)
+    print()
+    model.save(args.out)
+    print(f"saved {args.out} after {stats['updates']} updates in {stats['elapsed']:.1f}s")
+
+    means, rate = evaluate(model, args.eval_games, args.players)
+    print(f"learned seat vs {args.players - 1} random: mean penalty {means[0]:.2f}, "
+          f"random seats {means[1:].mean():.2f} ({rate:,.0f} decisions/sec batched)")
@@ -0,0 +1,218 @@
+import math
+import random
+import time
+
+from endgame import EndgameSolver
+from knowledge import Knowledge
+
+# -------------------------
+# AI Policies
+# -------------------------
+# A policy makes both AI decisions:
+#   choose_card(engine, player)      -> a card from player.hand (not removed)
+#   choose_row(engine, player, card) -> the row to take when `card` is lower
+#                                       than every row tail
+# Policies only read the engine; the engine applies their choices.
+
+class Policy:
+    name = "policy"
+
+    def choose_card(self, engine, player):
+        raise NotImplementedError
+
+    def choose_row(self, engine, player, card):
+        return engine.cheapest_row()
+
+    @classmethod
+    def reproducible(cls, seed):
+        # An instance whose choices depend only on the game and `seed`
+        return cls()
+
+class RandomPolicy(Policy):
+    name = "random"
+
+    def choose_card(self, engine, player):
+        return player.hand[int(engine.rng.random() * len(player.hand))]
+
+class LowestPolicy(Policy):
+    name = "lowest"
+
+    def choose_card(self, engine, player):
+        return min(player.hand)
+
+class HighestPolicy(Policy):
+    name = "highest"
+
+    def choose_card(self, engine, player):
+        return max(player.hand)
+
+# -------------------------
+# Monte Carlo Policy
+# -------------------------
+class MonteCarloPolicy(Policy): # Determinized rollouts over forked engines
+    name = "montecarlo"
+
+    def __init__(self, time_budget=1.0, max_rollouts=200, depth=2, endgame_tricks=2, seed=None):
+        # time_budget None: only max_rollouts bounds the search, so a seeded
+        # policy repeats its choices on any machine
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+        self.time_budget = time_budget
+        self.max_rollouts = max_rollouts
+        self.depth = depth  # extra tricks played out after the current one
+        self.rng = random.Random(seed)
+        self.rollouts = 0  # rollouts spent on the last decision
+        # In the last few tricks each sampled deal is solved exactly instead
+        # of played out at random
+        self.endgame = EndgameSolver(endgame_tricks) if endgame_tricks else None
+
+    def unseen_cards(self, engine, player):
+        # The full deck minus our hand, the table and every revealed card
+        return Knowledge.attach(engine).unseen(player)
+
+    def determinize(self, engine, player, hand_size):
+        # Fork the game with opponents' hands sampled from the unseen cards.
+        # Everyone in the fork plays randomly and takes the cheapest row.
+        fork = engine.copy(self.rng)
+        pool = self.unseen_cards(engine, player)
+        self.rng.shuffle(pool)
+        seat = engine.players.index(player)
+        for i, other in enumerate(fork.players):
+            other.policy = None
+            other.is_human = False
+            other.selected_card = None
+            if i != seat:
+                other.hand = pool[:hand_size]
+                del pool[:hand_size]
+        return fork
+
+    def play_out(self, fork):
+        for _ in range(self.depth):
+            if fork.hands_empty() or fork.is_over():
+                break
+            fork.resolve_trick(fork.collect_plays())
+
+    @classmethod
+    def reproducible(cls, seed):
+        return cls(time_budget=None, seed=seed)
+
+    def budget(self, engine):
+        # Seconds per decision, never more than the table's selection timer
+        if self.time_budget is None:
+            return math.inf
+        return min(self.time_budget, engine.rules.selection_time)
+
+    def evaluate(self, engine, player, hand_size, options, simulate):
+        # Total penalty taken by `player` over rollouts for each option;
+        # all options share each determinization.
+        totals = [0] * len(options)
+        seat = engine.players.index(player)
+        deadline = time.perf_counter() + self.budget(engine)
+        self.rollouts = 0
+        while self.rollouts < self.max_rollouts and time.perf_counter() < deadline:
+            base = self.determinize(engine, player, hand_size)
+            for k, option in enumerate(options):
+                fork = base.copy()
+                me = fork.players[seat]
+                before = me.penalty_points
+                simulate(fork, me, option)
+                totals[k] += me.penalty_points - before
+            self.rollouts += 1
+        return totals
+
+    def evaluate_exact(self, engine, player, hand_size, options, values_of):
+        # Like evaluate, but each sampled deal is scored by the endgame solver
+        totals = [0.0] * len(options)
+        seat = engine.players.index(player)
+        deadline = time.perf_counter() + self.budget(engine)
+        self.rollouts = 0
+        while self.rollouts < self.max_rollouts and time.perf_counter() < deadline:
+            fork = self.determinize(engine, player, hand_size)
+            values = values_of(self.endgame.rows_of(fork), self.endgame.hands_of(fork.players), seat)
+            for k, option in enumerate(options):
+                totals[k] += values[option]
+            self.rollouts += 1
+        return totals
+
+    def choose_card(self, engine, player):
+        if len(player.hand) == 1:
+            return player.hand[0]
+
+        options = list(player.hand)
+        if self.endgame is not None and self.endgame.can_solve(engine):
+            self.endgame.start_deal(engine)
+            totals = self.evaluate_exact(engine, player, engine.tricks_left, options,
+                                         self.endgame.card_values)
+            return options[min(range(len(options)), key=totals.__getitem__)]
+
+        def simulate(fork, me, card):
+            me.hand.remove(card)
+            plays = [(card, me)]
+            for other in fork.players:
+                if other is not me and other.hand:
+                    plays.append((other.hand.pop(int(self.rng.random() * len(other.hand))), other))
+            fork.resolve_trick(plays)
+            self.play_out(fork)
+
+        totals = self.evaluate(engine, player, engine.tricks_left, options, simulate)
+        return options[min(range(len(options)), key=totals.__getitem__)]
+
+    def choose_row(self, engine, player, card):
+        remaining = engine.trick[engine.trick_pos + 1:]
+
+        def simulate(fork, me, row_index):
+            # The fork's trick is on its own players; finish it, then play on
+            fork.place_next(row_index)
+            while fork.next_play() is not None:
+                fork.place_next()
+            self.play_out(fork)
+
+        # Mid-trick: every hand is already one card short
+        options = list(range(len(engine.table.tails)))
+        if self.endgame is not None and self.endgame.can_solve(engine):
+            self.endgame.start_deal(engine)
+            pending = tuple((other_card, False) for other_card, _ in remaining)
+
+            def values_of(rows, hands, me):
+                return self.endgame.row_values(rows, pending, hands, me, card)
+
+            totals = self.evaluate_exact(engine, player, engine.tricks_left - 1, options, values_of)
+            return options[min(range(len(options)), key=totals.__getitem__)]
+        totals = self.evaluate(engine, player, engine.tricks_left - 1, options, simulate)
+        return options[min(range(len(options)), key=totals.__getitem__)]
+
+# -------------------------
+# Learned Policy
+# -------------------------
+class LearnedPolicy(Policy): # Value nets trained by self-play in learn.py
+    name = "learned"
+
+    def __init__(self, path=None):
+        # numpy is only needed when this policy is used
+        import learn
+        path = path or learn.MODEL_PATH
+        try:
+            self.model = learn.CardModel.load(path)
+        except FileNotFoundError:
+            raise ValueError(f"No trained model at {path}; run `python learn.py` first")
+
+    def choose_card(self, engine, player):
+        return self.model.choose_card(engine, player)
+
+    def choose_row(self, engine, player, card):
+        return self.model.choose_row(engine, card)
+
+POLICIES = {
+    RandomPolicy.name: RandomPolicy,
+    LowestPolicy.name: LowestPolicy,
+    HighestPolicy.name: HighestPolicy,
+    MonteCarloPolicy.name: MonteCarloPolicy,
+    LearnedPolicy.name: LearnedPolicy,
+}
+
+def make_policy(name, seed=None):
+    # With a seed the policy plays the same way on every run (tournaments)
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy {name!r}, expected one of: {', '.join(POLICIES)}")
+    policy = POLICIES[name]
+    return policy() if seed is None else policy.reproducible(seed)
@@ -0,0 +1,237 @@
+import os
+import time
+from collections import deque
+
+import pygame
+
+from assets import Assets
+from engine import DECK_SIZE, get_bull_heads
+
+# -------------------------
+# Layout Constants
+# -------------------------
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 700
+CARD_WIDTH = 80
+CARD_HEIGHT = 120
+ROW_SPACING = 100
+
+# -------------------------
+# Render Cache
+# -------------------------
+class RenderCache: # Fonts, text labels and card faces built once, blitted every frame
+    MAX_LABELS = 1024
+
+    def __init__(self, assets=None):
+        self.assets = assets if assets is not None else Assets()
+        self.labels = {}
+        self.card_faces = {}
+        self.bull_img = None
+
+    def font(self, name, size, bold=False):
+        return self.assets.font(name, size, bold)
+
+    def label(self, text, size, color, name=None, bold=False):
+        # Rendered text surface; dynamic strings (scores, timer) are cached
+        # too, so the table is dropped if it ever grows past MAX_LABELS.
+        key = (text, size, color, name, bold)
+        surface = self.labels.get(key)
+        if surface is None:
+            if len(self.labels) >= self.MAX_LABELS:
+                self.labels.clear()
+            surface = self.labels[key] = self.font(name, size, bold).render(text, True, color)
+        return surface
+
+    def set_bull_image(self, bull_img):
+        if bull_img is not self.bull_img:
+            self.bull_img = bull_img
+            self.card_faces.clear()
+
+    def build_card_faces(self):
+        for number in range(1, DECK_SIZE + 1):
+            self.card_face(number)
+
+    def card_face(self, number):
+        face = self.card_faces.get(number)
+        if face is None:
+            face = self.card_faces[number] = self.assets.converted(self.compose_card(number))
+        return face
+
+    def compose_card(self, number):
+        face = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
+        pygame.draw.rect(face, (255, 255, 255), (0, 0, CARD_WIDTH, CARD_HEIGHT))
+        pygame.draw.rect(face, (0, 0, 0), (0, 0, CARD_WIDTH, CARD_HEIGHT), 2)
+
+        text = self.font(None, 36).render(str(number), True, (0, 0, 0))
+        face.blit(text, text.get_rect(center=(CARD_WIDTH // 2, CARD_HEIGHT // 2)))
+
+        if self.bull_img:
+            penalty = get_bull_heads(number)
+            max_per_row = CARD_WIDTH // (self.bull_img.get_width() + 2)
+            rows_needed = (penalty + max_per_row - 1) // max_per_row
+            for r in range(rows_needed):
+                bulls_in_row = min(max_per_row, penalty - r * max_per_row)
+                for i in range(bulls_in_row):
+                    bx = i * (self.bull_img.get_width() + 2) + 5
+                    by = r * (self.bull_img.get_height() + 2) + 5
+                    face.blit(self.bull_img, (bx, by))
+        return face
+
+# -------------------------
+# Frame Clock
+# -------------------------
+class FrameClock: # pygame Clock that also records how long each frame took to draw
+    def __init__(self, samples=120):
+        self.clock = pygame.time.Clock()
+        self.frame_ms = deque(maxlen=samples)
+        self.show_stats = False
+
+    def tick(self, framerate=0):
+        return self.clock.tick(framerate)
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+    def record(self, ms):
+        self.frame_ms.append(ms)
+
+    def average_ms(self):
+        return sum(self.frame_ms) / len(self.frame_ms) if self.frame_ms else 0.0
+
+    def worst_ms(self):
+        return max(self.frame_ms, default=0.0)
+
+    def stats_label(self, cache):
+        text = f"FPS {self.get_fps():4.1f}  frame {self.average_ms():4.1f} ms (max {self.worst_ms():.1f})"
+        label = cache.font(None, 24).render(text, True, (255, 255, 0))
+        panel = pygame.Surface((label.get_width() + 10, label.get_height() + 6))
+        panel.blit(label, (5, 3))
+        return panel
+
+def profile_panel(cache, clock, instruments, bins=10, bin_ms=4.0):
+    # FPS, per-phase ms per frame and a frame-time histogram
+    font = cache.font(None, 22)
+    frames = instruments.frames
+    busy = sum(seconds for seconds, _ in frames) * 1000 / len(frames) if frames else 0.0
+    lines = [f"FPS {clock.get_fps():4.1f}  busy {busy:5.2f} ms/frame"]
+    phases = sorted(instruments.phase_ms().items(), key=lambda item: -item[1][0])
+    lines += [f"{phase:<10} {ms:6.3f} ms  {calls:6.1f} calls" for phase, (ms, calls) in phases]
+    labels = [font.render(line, True, (255, 255, 0)) for line in lines]
+
+    chart_height = 50
+    width = max(220, max(label.get_width() for label in labels) + 10)
+    height = sum(label.get_height() for label in labels) + chart_height + 30
+    panel = pygame.Surface((width, height))
+    y = 3
+    for label in labels:
+        panel.blit(label, (5, y))
+        y += label.get_height()
+
+    counts = instruments.histogram(bins, bin_ms)
+    tallest = max(counts) or 1
+    bar = (width - 10) // bins
+    y += 5
+    for i, count in enumerate(counts):
+        bar_height = count * chart_height // tallest
+        pygame.draw.rect(panel, (255, 255, 0), (5 + i * bar, y + chart_height - bar_height, bar - 2, bar_height))
+    axis = font.render(f"0 ms{'':>20}{bins * bin_ms:.0f}+ ms", True, (255, 255, 0))
+    panel.blit(axis, (5, y + chart_height + 2))
+    return panel
+
+# -------------------------
+# Retained Scene
+# -------------------------
+class Scene: # Draw list diffed against the previous frame; only changes are redrawn
+    MAX_DIRTY = 32  # past this many rects one full-screen update is cheaper
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.items = {}
+        self.next = {}
+        self.full_redraw = True
+        self.started = 0.0
+
+    def begin(self):
+        self.next = {}
+        self.started = time.perf_counter()
+
+    def blit(self, key, surface, pos):
+        rect = pygame.Rect(pos, surface.get_size())
+        self.next[key] = ("blit", surface, rect)
+
+    def rect(self, key, color, rect, width=0):
+        rect = pygame.Rect(rect)
+        self.next[key] = ("rect", color, rect, width)
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def dirty_rects(self):
+        if self.full_redraw:
+            return [self.screen.get_rect()]
+        dirty = []
+        for key, item in self.next.items():
+            old = self.items.get(key)
+            if old != item:
+                dirty.append(item[2])
+                if old is not None:
+                    dirty.append(old[2])
+        for key, old in self.items.items():
+            if key not in self.next:
+                dirty.append(old[2])
+        if len(dirty) > self.MAX_DIRTY:
+            return [self.screen.get_rect()]
+        return dirty
+
+    def draw_item(self, item):
+        if item[0] == "blit":
+            self.screen.blit(item[1], item[2])
+        else:
+            pygame.draw.rect(self.screen, item[1], item[2], item[3])
+
+    def commit(self):
+        # Repaint background + intersecting items inside each dirty rect
+        dirty = self.dirty_rects()
+        self.items = self.next
+        self.full_redraw = False
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            self.screen.blit(self.background, rect, rect)
+            for item in self.items.values():
+                if item[2].colliderect(rect):
+                    self.draw_item(item)
+        self.screen.set_clip(None)
+        return dirty
+
+    def present(self, clock, cache):
+        if clock.show_stats:
+            self.blit("frame-stats", clock.stats_label(cache), (0, 0))
+        dirty = self.commit()
+        if dirty:
+            pygame.display.update(dirty)
+            clock.record((time.perf_counter() - self.started) * 1000)
+        return dirty
+
+def wait_events(timeout=None):
+    # Sleep until an event arrives or `timeout` ms pass (None waits forever)
+    if timeout is None:
+        event = pygame.event.wait()
+    else:
+        event = pygame.event.wait(max(int(timeout), 1))
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+# -------------------------
+# Game Module
+# -------------------------
+def load_game_module():
+    # 6nimmt.py cannot be imported by name (it starts with a digit); tools
+    # that drive its screens offscreen load it from its path
+    import importlib.util
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "6nimmt.py")
+    spec = importlib.util.spec_from_file_location("nimmt", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,443 @@
+import asyncio
+import json
+import os
+import random
+import time
+from collections import deque
+
+import snapshot
+from engine import RULES, Engine, Player, Rules
+from policies import make_policy
+from tournament import MAX_PLAYERS, MIN_PLAYERS
+
+# -------------------------
+# Protocol
+# -------------------------
+# Newline-delimited JSON over TCP, one object per line.
+#
+# client -> server
+#   {"type": "join", "table": "t1", "name": "bob", "players": 4, "humans": 2, "ai": "random"}
+#       The first join creates the table (players/humans/ai are only read
+#       then); the game starts once every human seat is taken. Names are
+#       limited to 255 bytes of UTF-8.
+#   {"type": "play", "card": 42}
+#   {"type": "row", "row": 2}
+# server -> client
+#   joined, select (hand, rows, scores, timeout), choose_row (card, rows),
+#   trick (plays, rows, scores), deal, game_over (scores), error (message)
+#
+# A human who does not answer within the table's selection time plays their lowest
+# card, or takes the cheapest row. Disconnected humans are auto-played.
+# Malformed messages get an error reply; a table that fails sends every
+# seat an error and closes its connections.
+#
+# With a checkpoint directory every table is snapshotted before each trick.
+# A restarted server reloads them; humans rejoin with the same table and
+# name, and the game continues from that trick.
+
+PORT = 8765
+LATENCY_SAMPLES = 256
+
+def send(writer, message):
+    if writer is not None and not writer.is_closing():
+        writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+# -------------------------
+# Seat
+# -------------------------
+class Seat: # One human player's connection and pending messages
+    def __init__(self, player, writer):
+        self.player = player
+        self.writer = writer
+        self.inbox = asyncio.Queue()
+        self.connected = True
+
+    def flush(self):
+        # Drop answers that arrived after their deadline
+        while not self.inbox.empty():
+            if self.inbox.get_nowait() is None:
+                self.connected = False
+
+    def disconnect(self):
+        self.connected = False
+        self.writer = None
+        self.inbox.put_nowait(None)  # wake a pending receive
+
+    async def receive(self, kind, field, deadline, valid):
+        # `field` of the next valid `kind` message before `deadline`
+        # (loop time), or None
+        loop = asyncio.get_running_loop()
+        while self.connected:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                message = await asyncio.wait_for(self.inbox.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if message is None:
+                return None
+            value = message.get(field)
+            if message.get("type") == kind and valid(value):
+                return value
+            send(self.writer, {"type": "error", "message": f"expected {kind} with a valid {field}"})
+        return None
+
+# -------------------------
+# Table Statistics
+# -------------------------
+class TableStats: # Per-table latency samples in ms
+    def __init__(self, samples=LATENCY_SAMPLES):
+        self.tricks = 0
+        self.games = 0
+        self.timeouts = 0
+        self.wait_ms = deque(maxlen=samples)  # select prompt -> all cards in
+        self.resolve_ms = deque(maxlen=samples)  # all cards in -> trick sent
+
+    def merge(self, other):
+        self.tricks += other.tricks
+        self.games += other.games
+        self.timeouts += other.timeouts
+        self.wait_ms.extend(other.wait_ms)
+        self.resolve_ms.extend(other.resolve_ms)
+
+    def summary(self):
+        return {
+            "tricks": self.tricks,
+            "games": self.games,
+            "timeouts": self.timeouts,
+            "wait_p50_ms": percentile(self.wait_ms, 0.5),
+            "resolve_p50_ms": percentile(self.resolve_ms, 0.5),
+            "resolve_p99_ms": percentile(self.resolve_ms, 0.99),
+        }
+
+# -------------------------
+# Table Host
+# -------------------------
+class TableHost: # Runs one game; human seats answer over the network
+    def __init__(self, table_id, player_count, humans, ai="random", rng=None, rules=RULES):
+        if not MIN_PLAYERS <= player_count <= MAX_PLAYERS:
+            raise ValueError(f"Need {MIN_PLAYERS}-{MAX_PLAYERS} players, got {player_count}")
+        if not 1 <= humans <= player_count:
+            raise ValueError(f"humans must be between 1 and {player_count}")
+        self.table_id = table_id
+        self.humans = humans
+        self.rules = rules
+        self.players = [Player(f"AI{i}", policy=make_policy(ai)) for i in range(1, player_count - humans + 1)]
+        self.seats = []
+        self.rng = rng if rng is not None else random.Random()
+        self.engine = None
+        self.checkpoint = None  # snapshot file, rewritten before every trick
+        self.stats = TableStats()
+        self.ready = asyncio.Event()
+        self.finished = False
+
+    @classmethod
+    def resume(cls, table_id, engine):
+        # A table restored from a snapshot, waiting for its humans to rejoin;
+        # it keeps the rules (and selection time) it was started with
+        humans = sum(player.is_human for player in engine.players)
+        table = cls(table_id, len(engine.players), humans, rng=engine.rng, rules=engine.rules)
+        table.players = engine.players
+        table.engine = engine
+        return table
+
+    @property
+    def selection_time(self):
+        return self.rules.selection_time
+
+    @property
+    def full(self):
+        return len(self.seats) >= self.humans
+
+    def join(self, name, writer):
+        if self.engine is not None:
+            # Resumed game: humans take back their own seats by name
+            player = next((player for player in self.players
+                           if player.is_human and player.name == name and self.seat_of(player) is None), None)
+            if player is None:
+                raise ValueError(f"no free seat named {name!r} at table {self.table_id!r}")
+        else:
+            # Humans sit first, in join order, then the AIs
+            player = Player(name, is_human=True)
+            self.players.insert(len(self.seats), player)
+        seat = Seat(player, writer)
+        self.seats.append(seat)
+        if self.full:
+            self.ready.set()
+        return seat
+
+    def seat_of(self, player):
+        for seat in self.seats:
+            if seat.player is player:
+                return seat
+        return None
+
+    def snapshot(self):
+        return {
+            "rows": self.engine.rows,
+            "scores": [player.penalty_points for player in self.players],
+        }
+
+    def broadcast(self, message):
+        for seat in self.seats:
+            send(seat.writer, message)
+
+    async def play(self):
+        await self.ready.wait()
+        loop = asyncio.get_running_loop()
+        if self.engine is None:
+            self.engine = Engine(self.players, self.rng, rules=self.rules)
+        names = [player.name for player in self.players]
+        self.broadcast({"type": "deal", "table": self.table_id, "players": names, **self.snapshot()})
+        while not self.engine.is_over():
+            if self.engine.hands_empty():
+                self.engine.deal()
+                self.broadcast({"type": "deal", "table": self.table_id, "players": names, **self.snapshot()})
+            await self.save_checkpoint(loop)
+            plays = await self.collect_plays(loop)
+            started = loop.time()
+            self.engine.start_trick(plays)
+            waited = await self.place_cards(loop)
+            self.stats.tricks += 1
+            self.broadcast({"type": "trick", "plays": [[card, self.players.index(player)] for card, player in plays],
+                            **self.snapshot()})
+            # Server-side cost only: time spent waiting on a row choice is excluded
+            self.stats.resolve_ms.append((loop.time() - started - waited) * 1000)
+            await self.drain()
+        self.stats.games += 1
+        self.broadcast({"type": "game_over", **self.snapshot()})
+        await self.drain()
+        self.finished = True
+        if self.checkpoint is not None and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+    async def save_checkpoint(self, loop):
+        # Encoded here, between tricks; only the file write leaves the loop
+        if self.checkpoint is not None:
+            await loop.run_in_executor(None, snapshot.write, self.checkpoint, snapshot.dumps(self.engine))
+
+    async def collect_plays(self, loop):
+        # Humans choose simultaneously against one deadline; AIs pick meanwhile
+        started = loop.time()
+        deadline = started + self.selection_time
+        for seat in self.seats:
+            seat.flush()
+            send(seat.writer, {"type": "select", "hand": sorted(seat.player.hand), "timeout": self.selection_time,
+                               **self.snapshot()})
+        choices = [self.receive_card(seat, deadline) for seat in self.seats if seat.player.hand]
+        await self.drain()
+        plays = []
+        for player in self.players:
+            if not player.is_human:
+                card = self.engine.choose_play(player)
+                if card:
+                    plays.append((card, player))
+        plays += await asyncio.gather(*choices)
+        self.stats.wait_ms.append((loop.time() - started) * 1000)
+        return plays
+
+    async def receive_card(self, seat, deadline):
+        player = seat.player
+        card = await seat.receive("play", "card", deadline, lambda card: type(card) is int and card in player.hand)
+        if card is None:
+            # Timed out or disconnected: play the lowest card, as the game does
+            self.stats.timeouts += seat.connected
+            return player.play_lowest(), player
+        player.hand.remove(card)
+        return card, player
+
+    async def place_cards(self, loop):
+        # Returns the seconds spent waiting for human row choices
+        engine = self.engine
+        waited = 0.0
+        while engine.next_play() is not None:
+            card, player = engine.next_play()
+            row_index = None
+            seat = self.seat_of(player) if player.is_human else None
+            if seat is not None and engine.needs_row_choice():
+                seat.flush()
+                send(seat.writer, {"type": "choose_row", "card": card, "timeout": self.selection_time,
+                                   **self.snapshot()})
+                await self.drain()
+                asked = loop.time()
+                rows = len(engine.table.tails)
+                row_index = await seat.receive("row", "row", loop.time() + self.selection_time,
+                                               lambda row: type(row) is int and 0 <= row < rows)
+                if row_index is None:
+                    self.stats.timeouts += seat.connected
+                    row_index = engine.cheapest_row()
+                waited += loop.time() - asked
+            engine.place_next(row_index)
+        return waited
+
+    async def drain(self):
+        for seat in self.seats:
+            if seat.writer is not None:
+                try:
+                    await seat.writer.drain()
+                except ConnectionError:
+                    seat.disconnect()
+
+# -------------------------
+# Server
+# -------------------------
+class GameServer: # Accepts clients and hosts any number of tables
+    def __init__(self, selection_time=RULES.selection_time, seed=None, checkpoint_dir=None):
+        self.rules = Rules(selection_time=selection_time)
+        self.rng = random.Random(seed)
+        self.checkpoint_dir = checkpoint_dir
+        self.tables = {}
+        self.tasks = set()
+        self.finished = TableStats(LATENCY_SAMPLES * 16)  # tables that have ended
+
+    def checkpoint_path(self, table_id):
+        # Table ids are arbitrary strings, so file names are their hex
+        return os.path.join(self.checkpoint_dir, table_id.encode().hex() + ".6ns")
+
+    def open_table(self, table_id, player_count, humans, ai="random"):
+        table = TableHost(table_id, player_count, humans, ai, random.Random(self.rng.random()), self.rules)
+        return self.start(table)
+
+    def start(self, table):
+        if self.checkpoint_dir is not None:
+            table.checkpoint = self.checkpoint_path(table.table_id)
+        self.tables[table.table_id] = table
+        task = asyncio.get_running_loop().create_task(self.host(table))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return table
+
+    def resume_tables(self):
+        # Reopen every checkpointed table; returns how many were restored
+        if self.checkpoint_dir is None:
+            return 0
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        restored = 0
+        for name in sorted(os.listdir(self.checkpoint_dir)):
+            if not name.endswith(".6ns"):
+                continue
+            path = os.path.join(self.checkpoint_dir, name)
+            try:
+                table_id = bytes.fromhex(name[:-4]).decode()
+                engine = snapshot.load(path)
+            except ValueError as error:
+                print(f"skipping checkpoint {path}: {error}")
+                continue
+            self.start(TableHost.resume(table_id, engine))
+            restored += 1
+        return restored
+
+    async def host(self, table):
+        try:
+            await table.play()
+        except Exception as error:
+            # A broken table must not leave its humans waiting forever
+            print(f"table {table.table_id!r} stopped: {error!r}")
+            for seat in table.seats:
+                send(seat.writer, {"type": "error", "message": "the table stopped on a server error"})
+                if seat.writer is not None:
+                    seat.writer.close()
+        finally:
+            self.tables.pop(table.table_id, None)
+            self.finished.merge(table.stats)
+
+    def join(self, message, writer):
+        table_id = str(message.get("table", "default"))
+        name = message.get("name")
+        if name is not None and len(str(name).encode()) > snapshot.MAX_TEXT:
+            # Checkpoints keep names whole, or the player could not rejoin
+            raise ValueError(f"names are limited to {snapshot.MAX_TEXT} bytes")
+        table = self.tables.get(table_id)
+        if table is None or table.full:
+            if table is not None:
+                raise ValueError(f"table {table_id!r} is full")
+            table = self.open_table(table_id, int(message.get("players", 4)), int(message.get("humans", 1)),
+                                    message.get("ai", "random"))
+        seat = table.join(str(name) if name is not None else f"Player{len(table.seats) + 1}", writer)
+        send(writer, {"type": "joined", "table": table_id, "seat": table.players.index(seat.player)})
+        return seat
+
+    async def handle_client(self, reader, writer):
+        seat = None
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    send(writer, {"type": "error", "message": "invalid JSON"})
+                    continue
+                if not isinstance(message, dict):
+                    send(writer, {"type": "error", "message": "expected a JSON object"})
+                    continue
+                if seat is not None:
+                    seat.inbox.put_nowait(message)
+                elif message.get("type") == "join":
+                    try:
+                        seat = self.join(message, writer)
+                    except (ValueError, TypeError) as error:
+                        send(writer, {"type": "error", "message": str(error)})
+                else:
+                    send(writer, {"type": "error", "message": "join a table first"})
+        except ConnectionError:
+            pass
+        finally:
+            if seat is not None:
+                seat.disconnect()
+            writer.close()
+
+    def stats(self):
+        # Latency percentiles over active and recently finished tables
+        totals = TableStats(samples=None)
+        totals.merge(self.finished)
+        for table in self.tables.values():
+            totals.merge(table.stats)
+        return {"tables": len(self.tables), **totals.summary()}
+
+    async def serve(self, host="127.0.0.1", port=PORT):
+        self.resume_tables()
+        return await asyncio.start_server(self.handle_client, host, port, limit=2 ** 16)
+
+# -------------------------
+# Run the server from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host 6nimmt! tables over TCP (newline-delimited JSON).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--selection-time", type=float, default=RULES.selection_time)
+    parser.add_argument("--report", type=float, default=5.0, help="seconds between stats lines")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--checkpoint-dir", default=None,
+                        help="snapshot every table here before each trick and resume them on restart")
+    args = parser.parse_args()
+
+    async def main():
+        server = GameServer(args.selection_time, args.seed, args.checkpoint_dir)
+        listener = await server.serve(args.host, args.port)
+        resumed = f", {len(server.tables)} tables resumed" if server.tables else ""
+        print(f"Serving on {args.host}:{args.port}{resumed}")
+        async with listener:
+            last = (time.perf_counter(), 0)
+            while True:
+                await asyncio.sleep(args.report)
+                stats = server.stats()
+                now = time.perf_counter()
+                rate = (stats["tricks"] - last[1]) / (now - last[0])
+                last = (now, stats["tricks"])
+                print(f"{stats['tables']} tables, {rate:,.0f} tricks/sec, {stats['games']} games done, "
+                      f"resolve p50 {stats['resolve_p50_ms']:.2f} ms p99 {stats['resolve_p99_ms']:.2f} ms, "
+                      f"{stats['timeouts']} timeouts", flush=True)
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,193 @@
+import os
+import random
+import struct
+import zlib
+
+from engine import SCORING, Engine, Player, Rules, Table
+from policies import make_policy
+
+# -------------------------
+# Snapshot Format
+# -------------------------
+# A whole engine in a few hundred bytes (plus 2.5 KB when the RNG state is
+# kept, so a resumed game deals exactly the cards it would have):
+#
+#   MAGIC
+#   header        HEADER: rules (deck size, hand size, rows, row limit,
+#                 losing score, selection time, scoring), players,
+#                 tricks left, trick position, then the lengths of the
+#                 trick, the undealt deck and the played cards, and whether
+#                 the RNG state follows
+#   per player    name (1 byte length + UTF-8), penalty (2 bytes), human
+#                 flag, policy name (1 byte length, empty = random), hand
+#                 (1 byte length + 1 byte per card)
+#   table         per row: 1 byte length + cards, then the deal's starters
+#   cards         undealt deck, played cards, trick as (card, seat) pairs
+#   rng           RNG_STATE: Mersenne Twister state, has_gauss, gauss_next
+#   crc           CRC-32 of everything before it (4 bytes)
+#
+# Cards fit one byte (Rules caps decks at MAX_CARD = 255).
+
+MAGIC = b"6NSNAP\x00\x02"
+HEADER = struct.Struct("<BBBBHdBBBBBBB?")
+PLAYER = struct.Struct("<HB")
+RNG_STATE = struct.Struct("<625I?d")
+CRC = struct.Struct("<I")
+SCORINGS = list(SCORING)
+MAX_TEXT = 255  # bytes of UTF-8 per name
+
+def pack_text(text):
+    # Longer text is cut on a character boundary, so it still decodes
+    data = text.encode()[:MAX_TEXT].decode(errors="ignore").encode()
+    return bytes([len(data)]) + data
+
+def pack_cards(cards):
+    return bytes([len(cards)]) + bytes(cards)
+
+class Reader: # Cursor over a snapshot's bytes
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def take(self, size):
+        chunk = self.data[self.pos:self.pos + size]
+        if len(chunk) != size:
+            raise ValueError("Truncated snapshot")
+        self.pos += size
+        return chunk
+
+    def byte(self):
+        return self.take(1)[0]
+
+    def text(self):
+        return self.take(self.byte()).decode()
+
+    def cards(self, count=None):
+        return list(self.take(self.byte() if count is None else count))
+
+    def unpack(self, layout):
+        return layout.unpack(self.take(layout.size))
+
+# -------------------------
+# Save and Restore
+# -------------------------
+def dumps(engine, rng=True):
+    rules = engine.rules
+    table = engine.table
+    out = bytearray(MAGIC)
+    out += HEADER.pack(rules.deck_size, rules.hand_size, rules.rows, rules.row_limit, rules.max_penalty,
+                       rules.selection_time, SCORINGS.index(rules.scoring), len(engine.players),
+                       max(engine.tricks_left, 0), engine.trick_pos, len(engine.trick), len(engine.deck),
+                       len(engine.played), rng)
+    for player in engine.players:
+        out += pack_text(player.name)
+        out += PLAYER.pack(player.penalty_points, player.is_human)
+        out += pack_text(player.policy.name if player.policy is not None else "")
+        out += pack_cards(player.hand)
+    for i in range(len(table.tails)):
+        out += pack_cards(table.row(i))
+    out += bytes(engine.starters)
+    out += bytes(engine.deck)
+    out += bytes(engine.played)
+    seats = {player: seat for seat, player in enumerate(engine.players)}
+    for card, player in engine.trick:
+        out += bytes((card, seats[player]))
+    if rng:
+        _, state, gauss_next = engine.rng.getstate()
+        out += RNG_STATE.pack(*state, gauss_next is not None, gauss_next or 0.0)
+    out += CRC.pack(zlib.crc32(out))
+    return bytes(out)
+
+def loads(data, rng=None):
+    # Policies are rebuilt from their names with default settings. `rng`
+    # replaces a saved RNG state (and is required when none was saved).
+    # Any damaged or inconsistent snapshot raises ValueError.
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a 6nimmt! snapshot")
+    if len(data) < len(MAGIC) + CRC.size or CRC.unpack(data[-CRC.size:])[0] != zlib.crc32(data[:-CRC.size]):
+        raise ValueError("Corrupt snapshot (checksum mismatch)")
+    try:
+        return parse(data[:-CRC.size], rng)
+    except (IndexError, KeyError) as error:
+        raise ValueError(f"Corrupt snapshot ({error})") from None
+
+def parse(data, rng):
+    reader = Reader(data)
+    reader.take(len(MAGIC))
+    (deck_size, hand_size, rows, row_limit, max_penalty, selection_time, scoring, player_count, tricks_left,
+     trick_pos, trick_size, deck_left, played_size, has_rng) = reader.unpack(HEADER)
+    rules = Rules(deck_size, hand_size, rows, row_limit, max_penalty, selection_time, SCORINGS[scoring])
+
+    players = []
+    for _ in range(player_count):
+        name = reader.text()
+        penalty, is_human = reader.unpack(PLAYER)
+        policy = reader.text()
+        player = Player(name, bool(is_human), make_policy(policy) if policy else None)
+        player.penalty_points = penalty
+        player.hand = reader.cards()
+        players.append(player)
+
+    table = Table.from_rows([reader.cards() for _ in range(rows)], rules.row_limit, rules.penalties)
+    starters = reader.cards(rows)
+    deck = reader.cards(deck_left)
+    played = reader.cards(played_size)
+    trick = [(card, players[seat]) for card, seat in (reader.take(2) for _ in range(trick_size))]
+    if has_rng:
+        *state, has_gauss, gauss_next = reader.unpack(RNG_STATE)
+        if rng is None:
+            rng = random.Random()
+            rng.setstate((3, tuple(state), gauss_next if has_gauss else None))
+    elif rng is None:
+        raise ValueError("Snapshot has no RNG state; pass rng")
+    if reader.pos != len(data):
+        raise ValueError("Corrupt snapshot (trailing data)")
+    return Engine.restore(players, rules, rng, table, starters, deck, played, trick, trick_pos, tricks_left)
+
+def write(path, data):
+    # Written to a temporary file and renamed, so a crash mid-write leaves
+    # the previous snapshot intact
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+
+def save(engine, path, rng=True):
+    write(path, dumps(engine, rng))
+
+def load(path, rng=None):
+    with open(path, "rb") as f:
+        return loads(f.read(), rng)
+
+# -------------------------
+# Inspect a snapshot from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Show a saved 6nimmt! game or time snapshots and forks.")
+    parser.add_argument("path", nargs="?", help="snapshot file to show")
+    parser.add_argument("--bench", type=int, default=0, help="time this many snapshots, restores and forks")
+    args = parser.parse_args()
+
+    if args.path:
+        engine = load(args.path)
+        for i, row in enumerate(engine.rows):
+            print(f"row {i + 1}: {row}")
+        for player in engine.players:
+            print(f"{player.name}: {player.penalty_points} points, hand {sorted(player.hand)}")
+        print(f"{engine.tricks_left} tricks left in the deal")
+    if args.bench:
+        engine = Engine([Player(f"AI{i}") for i in range(1, 5)], random.Random(1))
+        engine.resolve_trick(engine.collect_plays())
+        for label, fn in (("dumps", lambda: dumps(engine)), ("dumps (no rng)", lambda: dumps(engine, False)),
+                          ("loads", lambda data=dumps(engine): loads(data)), ("fork", engine.copy)):
+            start = time.perf_counter()
+            for _ in range(args.bench):
+                fn()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<16} {elapsed / args.bench * 1e6:8.2f} us ({args.bench / elapsed:,.0f}/sec)")
+        print(f"snapshot size {len(dumps(engine))} bytes, {len(dumps(engine, False))} without the RNG state")
@@ -0,0 +1,233 @@
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine import DECK_SIZE, HAND_SIZE, MAX_PENALTY, ROW_LIMIT, ROWS, Engine, Player, Rules
+from tournament import chunk_seed
+
+RULE_OPTIONS = ("deck_size", "hand_size", "rows", "row_limit", "max_penalty", "scoring")
+VARIANTS = ("classic", "tactics")
+MAX_TRICKS = 5000  # games still running after this many tricks are cut off
+
+# -------------------------
+# Streaming Distributions
+# -------------------------
+class Distribution: # Count, moments, extremes and an exact histogram of integer samples
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.sq_total = 0
+        self.histogram = {}
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.sq_total += value * value
+        self.histogram[value] = self.histogram.get(value, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.sq_total += other.sq_total
+        for value, count in other.histogram.items():
+            self.histogram[value] = self.histogram.get(value, 0) + count
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self.sq_total - self.count * self.mean ** 2, 0.0) / (self.count - 1))
+
+    def quantile(self, q):
+        seen = 0
+        rank = q * self.count
+        for value in sorted(self.histogram):
+            seen += self.histogram[value]
+            if seen >= rank:
+                return value
+        return 0
+
+    def summary(self):
+        values = self.histogram
+        return {"mean": round(self.mean, 3), "std": round(self.std, 3), "min": min(values, default=0),
+                "p50": self.quantile(0.5), "p95": self.quantile(0.95), "max": max(values, default=0)}
+
+class ConfigStats: # Every distribution collected for one configuration
+    FIELDS = ("tricks", "deals", "penalty", "winner", "loser")
+
+    def __init__(self, config):
+        self.config = config
+        self.games = 0
+        self.cut_off = 0
+        for field in self.FIELDS:
+            setattr(self, field, Distribution())
+
+    def add_game(self, tricks, deals, penalties, finished):
+        self.games += 1
+        self.cut_off += not finished
+        self.tricks.add(tricks)
+        self.deals.add(deals)
+        for penalty in penalties:
+            self.penalty.add(penalty)
+        self.winner.add(min(penalties))
+        self.loser.add(max(penalties))
+
+    def merge(self, other):
+        self.games += other.games
+        self.cut_off += other.cut_off
+        for field in self.FIELDS:
+            getattr(self, field).merge(getattr(other, field))
+
+    def to_json(self):
+        result = {"config": self.config, "games": self.games, "cut_off": self.cut_off}
+        for field in self.FIELDS:
+            result[field] = getattr(self, field).summary()
+        return result
+
+# -------------------------
+# Configurations
+# -------------------------
+def make_rules(config):
+    # `config` is a plain dict (picklable, JSON-friendly): players, variant
+    # and any Rules option. "tactics" sizes the deck to the player count.
+    options = {name: config[name] for name in RULE_OPTIONS if name in config}
+    variant = config.get("variant", "classic")
+    if variant == "tactics":
+        rules = Rules.tactics(config["players"], **options)
+    elif variant == "classic":
+        rules = Rules(**options)
+    else:
+        raise ValueError(f"Unknown variant {variant!r}, expected one of: {', '.join(VARIANTS)}")
+    rules.check_players(config["players"])
+    return rules
+
+def grid(players, deck_sizes=(DECK_SIZE,), hand_sizes=(HAND_SIZE,), rows=(ROWS,), row_limits=(ROW_LIMIT,),
+         max_penalties=(MAX_PENALTY,), variants=("classic",), scorings=("bull_heads",)):
+    # Every combination; a deck size of "auto" grows the deck past 104 cards
+    # just enough to deal full hands at big tables
+    configs = []
+    for values in itertools.product(players, deck_sizes, hand_sizes, rows, row_limits, max_penalties,
+                                    variants, scorings):
+        config = dict(zip(("players", "deck_size", "hand_size", "rows", "row_limit", "max_penalty",
+                           "variant", "scoring"), values))
+        if config["deck_size"] == "auto":
+            config["deck_size"] = max(DECK_SIZE, config["players"] * config["hand_size"] + config["rows"])
+        if config["variant"] == "tactics":
+            del config["deck_size"]
+        if config not in configs:
+            configs.append(config)
+    return configs
+
+# -------------------------
+# Worker
+# -------------------------
+def play_configs(config, games, seed):
+    rng = random.Random(seed)
+    rules = make_rules(config)
+    stats = ConfigStats(config)
+    for _ in range(games):
+        players = [Player(f"AI{i + 1}") for i in range(config["players"])]
+        engine = Engine(players, rng, rules=rules)
+        tricks = 0
+        deals = 1
+        while not engine.is_over() and tricks < MAX_TRICKS:
+            if engine.hands_empty():
+                engine.deal()
+                deals += 1
+            else:
+                engine.resolve_trick(engine.collect_plays())
+                tricks += 1
+        stats.add_game(tricks, deals, [player.penalty_points for player in players], engine.is_over())
+    return stats
+
+# -------------------------
+# Sweep
+# -------------------------
+def run_sweep(configs, games, workers=None, seed=0, chunk_size=500, on_progress=None):
+    # Returns one ConfigStats per config, in order. Chunks of every config
+    # share one pool, so small and slow configs balance across workers.
+    for config in configs:
+        make_rules(config)  # fail fast on a bad config, before spawning workers
+    results = [ConfigStats(config) for config in configs]
+    tasks = [(i, min(chunk_size, games - start), chunk_seed(seed, f"{i}.{start}"))
+             for i in range(len(configs)) for start in range(0, games, chunk_size)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(play_configs, configs[i], size, chunk): i for i, size, chunk in tasks}
+        done = 0
+        for future in as_completed(futures):
+            stats = future.result()
+            results[futures[future]].merge(stats)
+            done += stats.games
+            if on_progress is not None:
+                on_progress(done, games * len(configs), time.perf_counter() - start)
+    return results, time.perf_counter() - start
+
+def describe(config):
+    deck = config.get("deck_size", "tactics")
+    return (f"{config['players']:>3}p deck {deck:>7} hand {config.get('hand_size', HAND_SIZE):>2} "
+            f"rows {config.get('rows', ROWS)} limit {config.get('row_limit', ROW_LIMIT)} "
+            f"to {config.get('max_penalty', MAX_PENALTY):>3} {config.get('scoring', 'bull_heads'):<10}")
+
+# -------------------------
+# Run a sweep from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+
+    def ints(text):
+        return [value if value == "auto" else int(value) for value in text.split(",")]
+
+    def names(text):
+        return [value.strip() for value in text.split(",") if value.strip()]
+
+    parser = argparse.ArgumentParser(description="Sweep 6nimmt! rule variants and player counts.")
+    parser.add_argument("--players", type=ints, default=[4], help="comma-separated player counts")
+    parser.add_argument("--deck-size", type=ints, default=[DECK_SIZE], help="card counts, or 'auto'")
+    parser.add_argument("--hand-size", type=ints, default=[HAND_SIZE])
+    parser.add_argument("--rows", type=ints, default=[ROWS])
+    parser.add_argument("--row-limit", type=ints, default=[ROW_LIMIT])
+    parser.add_argument("--max-penalty", type=ints, default=[MAX_PENALTY])
+    parser.add_argument("--variant", type=names, default=["classic"], help=f"any of: {', '.join(VARIANTS)}")
+    parser.add_argument("--scoring", type=names, default=["bull_heads"], help="bull_heads or flat")
+    parser.add_argument("--games", type=int, default=2000, help="games per configuration")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="write one JSON line per configuration to this file")
+    args = parser.parse_args()
+
+    configs = []
+    for config in grid(args.players, args.deck_size, args.hand_size, args.rows, args.row_limit,
+                       args.max_penalty, args.variant, args.scoring):
+        try:
+            make_rules(config)
+            configs.append(config)
+        except ValueError as error:
+            print(f"skipping {config}: {error}")
+
+    def progress(done, total, elapsed):
+        print(f"\r{done}/{total} games ({done / elapsed:,.0f} games/sec)", end="", flush=True)
+
+    results, elapsed = run_sweep(configs, args.games, args.workers, args.seed, args.chunk_size, progress)
+    print()
+    print(f"{'configuration':<58} {'tricks':>13} {'deals':>6} {'penalty':>13} {'winner':>7} {'cut':>4}")
+    for stats in results:
+        print(f"{describe(stats.config):<58} {stats.tricks.mean:>6.1f} p95 {stats.tricks.quantile(0.95):>3} "
+              f"{stats.deals.mean:>6.2f} {stats.penalty.mean:>6.1f} ±{stats.penalty.std:>5.1f} "
+              f"{stats.winner.mean:>7.1f} {stats.cut_off:>4}")
+    if args.json:
+        with open(args.json, "w") as f:
+            for stats in results:
+                f.write(json.dumps(stats.to_json()) + "\n")
+    games = args.games * len(configs)
+    print(f"{len(configs)} configurations, {games} games in {elapsed:.2f}s on {args.workers} workers "
+          f"({games / elapsed:,.0f} games/sec)")
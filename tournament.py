@@ -0,0 +1,168 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine import Engine, Player, game_rng
+from gamelog import GameLogWriter, GameRecorder
+from policies import make_policy
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 10
+
+# -------------------------
+# Seat Statistics
+# -------------------------
+class SeatStats: # Streaming totals, mergeable across workers
+    def __init__(self, policy):
+        self.policy = policy
+        self.games = 0
+        self.penalty_sum = 0
+        self.penalty_sq_sum = 0
+        self.wins = 0.0
+        self.losses = 0
+
+    def add_game(self, penalty, win_share, lost):
+        self.games += 1
+        self.penalty_sum += penalty
+        self.penalty_sq_sum += penalty * penalty
+        self.wins += win_share
+        self.losses += lost
+
+    def merge(self, totals):
+        games, penalty_sum, penalty_sq_sum, wins, losses = totals
+        self.games += games
+        self.penalty_sum += penalty_sum
+        self.penalty_sq_sum += penalty_sq_sum
+        self.wins += wins
+        self.losses += losses
+
+    def totals(self):
+        return (self.games, self.penalty_sum, self.penalty_sq_sum, self.wins, self.losses)
+
+    @property
+    def mean_penalty(self):
+        return self.penalty_sum / self.games if self.games else 0.0
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def loss_rate(self):
+        return self.losses / self.games if self.games else 0.0
+
+    def penalty_ci(self, z=1.96):
+        # Normal-approximation confidence interval for the mean penalty
+        if self.games < 2:
+            return (self.mean_penalty, self.mean_penalty)
+        mean = self.mean_penalty
+        var = (self.penalty_sq_sum - self.games * mean * mean) / (self.games - 1)
+        half = z * math.sqrt(max(var, 0.0) / self.games)
+        return (mean - half, mean + half)
+
+    def win_ci(self, z=1.96):
+        # Wilson score interval for the win rate
+        n = self.games
+        if not n:
+            return (0.0, 0.0)
+        p = self.win_rate
+        denom = 1 + z * z / n
+        centre = (p + z * z / (2 * n)) / denom
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+        return (max(centre - half, 0.0), min(centre + half, 1.0))
+
+# -------------------------
+# Worker
+# -------------------------
+def chunk_seed(seed, chunk_index):
+    # Each chunk gets its own stream, so results do not depend on which
+    # worker runs it or in what order chunks finish.
+    return f"6nimmt:{seed}:{chunk_index}"
+
+def play_chunk(policy_names, games, seed, log=False):
+    # Returns per-seat totals and, with `log`, the encoded game log blocks
+    rng = random.Random(seed)
+    # Seeded from the chunk, so search policies repeat too
+    policies = [make_policy(name, rng.getrandbits(63)) for name in policy_names]
+    stats = [SeatStats(name) for name in policy_names]
+    blocks = bytearray()
+    for _ in range(games):
+        players = [Player(f"{name}{i + 1}", policy=policy)
+                   for i, (name, policy) in enumerate(zip(policy_names, policies))]
+        engine_rng, seed = game_rng(rng)
+        recorder = GameRecorder(players, seed) if log else None
+        Engine(players, engine_rng, recorder).play_to_end()
+        if recorder is not None:
+            blocks += recorder.finish()
+        penalties = [player.penalty_points for player in players]
+        best = min(penalties)
+        winners = penalties.count(best)
+        worst = max(penalties)  # every seat tied on the most points loses
+        for seat, penalty in zip(stats, penalties):
+            seat.add_game(penalty, 1 / winners if penalty == best else 0.0, penalty == worst)
+    return [seat.totals() for seat in stats], bytes(blocks)
+
+# -------------------------
+# Tournament
+# -------------------------
+def run_tournament(policy_names, games, workers=None, seed=0, chunk_size=250, on_progress=None, log_path=None):
+    if not MIN_PLAYERS <= len(policy_names) <= MAX_PLAYERS:
+        raise ValueError(f"Need {MIN_PLAYERS}-{MAX_PLAYERS} players, got {len(policy_names)}")
+    for name in policy_names:
+        make_policy(name)  # fail fast on typos, before spawning workers
+
+    stats = [SeatStats(name) for name in policy_names]
+    chunks = [min(chunk_size, games - start) for start in range(0, games, chunk_size)]
+    log = GameLogWriter(log_path) if log_path else None
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_chunk, policy_names, size, chunk_seed(seed, i), log is not None)
+                   for i, size in enumerate(chunks)]
+        for future in as_completed(futures):
+            chunk_totals, blocks = future.result()
+            for seat, totals in zip(stats, chunk_totals):
+                seat.merge(totals)
+            if log is not None:
+                # Games are appended in chunk completion order
+                log.write(blocks, chunk_totals[0][0])
+            if on_progress is not None:
+                on_progress(stats[0].games, games, time.perf_counter() - start)
+    if log is not None:
+        log.close()
+    return stats, time.perf_counter() - start
+
+# -------------------------
+# Run a tournament from the command line
+# -------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pit 6nimmt! AI policies against each other.")
+    parser.add_argument("--players", type=int, default=4, help="number of players (2-10)")
+    parser.add_argument("--policies", default="random",
+                        help="comma-separated policy per seat; missing seats play random")
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=250)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log", default=None, help="append every game to this game log")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.policies.split(",") if name.strip()]
+    names = (names + ["random"] * args.players)[:args.players]
+
+    def progress(done, total, elapsed):
+        print(f"\r{done}/{total} games ({done / elapsed:,.0f} games/sec)", end="", flush=True)
+
+    stats, elapsed = run_tournament(names, args.games, args.workers, args.seed, args.chunk_size, progress,
+                                    args.log)
+    print()
+    for i, seat in enumerate(stats):
+        low, high = seat.penalty_ci()
+        win_low, win_high = seat.win_ci()
+        print(f"Seat {i + 1} ({seat.policy}): win {seat.win_rate:.1%} [{win_low:.1%}, {win_high:.1%}], "
+              f"mean penalty {seat.mean_penalty:.2f} [{low:.2f}, {high:.2f}], lose {seat.loss_rate:.1%}")
+    print(f"{args.games} games in {elapsed:.2f}s on {args.workers} workers "
+          f"({args.games / elapsed:,.0f} games/sec)")